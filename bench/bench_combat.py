@@ -0,0 +1,90 @@
+# bench/bench_combat.py
+# Equivalence check + timing: CombatManager vs VectorizedCombatManager.
+# Run from the repo root:  python -m bench.bench_combat
+import time
+
+import numpy as np
+
+from core.clock import ManualClock
+from cv.roi import get_default_rois
+from core.player import Player
+from logic.combat import CombatManager
+from logic.combat_vectorized import VectorizedCombatManager
+
+WIDTH, HEIGHT = 1280, 720
+DT = 1.0 / 60
+KINDS = ["fireball", "heavy_attack", "water_ball"]
+
+
+def make_players(clock):
+    rois = get_default_rois(WIDTH, HEIGHT)
+    return {1: Player(1, rois[0], clock=clock), 2: Player(2, rois[1], clock=clock)}
+
+
+def make_script(seed, ticks, spawn_rate):
+    """Per tick: list of ("p", x, y, dir, kind, owner) / ("w", x, y, owner) spawns."""
+    rng = np.random.default_rng(seed)
+    rois = get_default_rois(WIDTH, HEIGHT)
+    script = []
+    for _ in range(ticks):
+        events = []
+        for _ in range(rng.poisson(spawn_rate)):
+            owner = int(rng.integers(1, 3))
+            roi = rois[owner - 1]
+            direction = 1 if owner == 1 else -1
+            x = roi.x + roi.w if owner == 1 else roi.x
+            y = roi.y + roi.h // 2 + int(rng.integers(-60, 61))
+            if rng.random() < 0.1:
+                wall_x = x + 50 * direction - (40 if owner == 2 else 0)
+                events.append(("w", wall_x, y - 75, owner))
+            else:
+                events.append(("p", x, y, direction, KINDS[int(rng.integers(0, 3))], owner))
+        script.append(events)
+    return script
+
+
+def run(engine_cls, script):
+    clock = ManualClock()
+    players = make_players(clock)
+    for player in players.values():
+        player.hp = 1e6  # HP clamps at 0; a deep pool keeps long runs counting damage
+    combat = engine_cls()
+    alive = []
+    t0 = time.perf_counter()
+    for events in script:
+        for e in events:
+            if e[0] == "p":
+                combat.spawn_projectile(e[1], e[2], e[3], e[4], e[5])
+            else:
+                combat.spawn_wall(e[1], e[2], e[3])
+        combat.update(DT, players)
+        clock.advance(DT)
+        alive.append(len(combat.projectiles))
+    elapsed = time.perf_counter() - t0
+    return elapsed, [players[1].hp, players[2].hp], alive
+
+
+def main():
+    print("equivalence (final HP and live projectile count per tick):")
+    mismatches = 0
+    for seed in range(20):
+        script = make_script(seed, ticks=600, spawn_rate=0.3)
+        _, hp_a, alive_a = run(CombatManager, script)
+        _, hp_b, alive_b = run(VectorizedCombatManager, script)
+        same = hp_a == hp_b and alive_a == alive_b
+        mismatches += not same
+        if not same:
+            first = next((i for i, (a, b) in enumerate(zip(alive_a, alive_b)) if a != b), None)
+            print(f"  seed {seed}: classic hp={hp_a} vectorized hp={hp_b} first count mismatch at tick {first}")
+    print(f"  {20 - mismatches}/20 randomized matches identical")
+
+    print(f"\n{'spawn/tick':>10} {'avg live':>9} {'classic ms/tick':>16} {'vectorized ms/tick':>19}")
+    for rate in (0.5, 2, 5, 10):
+        script = make_script(1, ticks=300, spawn_rate=rate)
+        t_a, _, alive = run(CombatManager, script)
+        t_b, _, _ = run(VectorizedCombatManager, script)
+        print(f"{rate:>10} {np.mean(alive):>9.0f} {t_a / len(script) * 1e3:>16.3f} {t_b / len(script) * 1e3:>19.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# bench/bench_compositor.py
+# Microbenchmark: legacy float32 overlay vs the in-place uint8 compositor.
+# Run from the repo root:  python -m bench.bench_compositor
+import os
+import time
+
+import cv2
+import numpy as np
+
+from ui.compositor import BlendScratch
+from ui.sprite_cache import SpriteCache
+from ui.vfx_overlay import (overlay_png_at_point, overlay_sprite_at_point,
+                            overlay_gif_greenscreen_at_point)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SIZES = (240, 260, 300, 420)  # water, fireball, heavy, skeleton wall in main.py
+
+
+def legacy_png(base_bgr, png_bgra, center_xy, size_px):
+    # float32 path as it was before ui/compositor.py
+    cx, cy = center_xy
+    png = cv2.resize(png_bgra, (size_px, size_px), interpolation=cv2.INTER_LINEAR)
+    x1, y1 = int(cx - size_px // 2), int(cy - size_px // 2)
+    region = base_bgr[y1:y1 + size_px, x1:x1 + size_px].astype(np.float32)
+    eff = png.astype(np.float32)
+    a = eff[:, :, 3:4] / 255.0
+    comp = region * (1.0 - a) + eff[:, :, :3] * a
+    base_bgr[y1:y1 + size_px, x1:x1 + size_px] = np.clip(comp, 0, 255).astype(np.uint8)
+    return base_bgr
+
+
+def legacy_greenscreen(base_bgr, gif_bgr, center_xy, size_px, key_green=(0, 255, 0), tol=90):
+    cx, cy = center_xy
+    eff = cv2.resize(gif_bgr, (size_px, size_px), interpolation=cv2.INTER_LINEAR)
+    x1, y1 = int(cx - size_px // 2), int(cy - size_px // 2)
+    region = base_bgr[y1:y1 + size_px, x1:x1 + size_px].astype(np.float32)
+    e = eff.astype(np.float32)
+    key = np.array(key_green, dtype=np.float32).reshape(1, 1, 3)
+    mask = (np.linalg.norm(e - key, axis=2) > float(tol)).astype(np.float32)[..., None]
+    comp = region * (1.0 - mask) + e * mask
+    base_bgr[y1:y1 + size_px, x1:x1 + size_px] = np.clip(comp, 0, 255).astype(np.uint8)
+    return base_bgr
+
+
+def time_it(fn, repeat=200):
+    fn()  # warm-up (grows scratch buffers, builds sprites)
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) / repeat * 1e6
+
+
+def main():
+    png = cv2.imread(os.path.join(BASE_DIR, "assets", "vfx", "fireball.png"), cv2.IMREAD_UNCHANGED)
+    gif_frame = np.zeros((300, 300, 3), np.uint8)
+    gif_frame[:] = (0, 255, 0)
+    cv2.circle(gif_frame, (150, 150), 90, (40, 40, 200), -1)
+
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 256, (720, 1280, 3), dtype=np.uint8)
+    center = (640, 360)
+
+    cache = SpriteCache()
+    cache.register("fireball", png)
+    scratch = BlendScratch()
+
+    print(f"{'size':>5} {'legacy png':>11} {'png':>8} {'sprite':>8} {'legacy key':>11} {'key':>8}   (us/call)")
+    for size in SIZES:
+        sprite = cache.get("fireball", size)
+
+        f = frame.copy()
+        t_legacy = time_it(lambda: legacy_png(f, png, center, size))
+        t_png = time_it(lambda: overlay_png_at_point(f, png, center, size, scratch=scratch))
+        t_sprite = time_it(lambda: overlay_sprite_at_point(f, sprite, center, scratch=scratch))
+        t_legacy_key = time_it(lambda: legacy_greenscreen(f, gif_frame, center, size))
+        t_key = time_it(lambda: overlay_gif_greenscreen_at_point(f, gif_frame, center, size, tol=90,
+                                                                 scratch=scratch))
+
+        a = legacy_png(frame.copy(), png, center, size).astype(np.int16)
+        b = overlay_png_at_point(frame.copy(), png, center, size, scratch=scratch).astype(np.int16)
+        max_diff = int(np.abs(a - b).max())
+
+        print(f"{size:>5} {t_legacy:>11.1f} {t_png:>8.1f} {t_sprite:>8.1f} {t_legacy_key:>11.1f} {t_key:>8.1f}"
+              f"   max |diff| vs legacy: {max_diff} LSB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# bench/bench_detect_modes.py
+# Per-ROI crop detection vs one full-frame pass (DetectionPipeline full_frame=True) at the game's
+# resolutions: p50/p95 latency per frame and how often each player's sign is found.
+# Test frames paste the labeled sign images from media/ into the two player ROIs.
+# Run from the repo root:  python -m bench.bench_detect_modes [--model model/best.pt] [--frame-sizes 640 960 1280]
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from bench.bench_detector import load_labeled_images
+from cv.detection_pipeline import DetectionPipeline
+from cv.inference_backends import BACKENDS
+from cv.roi import get_default_rois
+from cv.yolo_detector import YOLODetector
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_frames(images, width, height, hand_size=320, seed=0):
+    """(frame, {player_id: expected label}) with one sign image centered in each ROI."""
+    rng = np.random.default_rng(seed)
+    rois = get_default_rois(width, height)
+    frames = []
+    for i in range(len(images)):
+        frame = rng.integers(60, 120, (height, width, 3), dtype=np.uint8)
+        expected = {}
+        for k, roi in enumerate(rois):
+            label, img = images[(i + k) % len(images)]
+            s = hand_size / max(img.shape[:2])
+            img = cv2.resize(img, (round(img.shape[1] * s), round(img.shape[0] * s)))
+            x = int(roi.x + (roi.w - img.shape[1]) / 2)
+            y = int(roi.y + (roi.h - img.shape[0]) / 2)
+            frame[y:y + img.shape[0], x:x + img.shape[1]] = img
+            expected[roi.player_id] = label
+        frames.append((frame, expected))
+    return frames
+
+
+def run_mode(pipeline, frames, repeat):
+    pipeline.run_once(frames[0][0], 0.0, 0)  # warm-up (buffers for this shape)
+    times = []
+    found = 0
+    for seq, (frame, expected) in enumerate(frames, start=1):
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            result = pipeline.run_once(frame, 0.0, seq)
+            times.append(time.perf_counter() - t0)
+        found += sum(1 for pid, label in expected.items() if (result.signs.get(pid) or "").lower() == label)
+    return times, found
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-ROI crops vs a single full-frame detection pass")
+    parser.add_argument("--model", default=os.path.join(BASE_DIR, "model", "best.pt"))
+    parser.add_argument("--backend", default="auto", choices=BACKENDS)
+    parser.add_argument("--images", default=os.path.join(BASE_DIR, "media"))
+    parser.add_argument("--resolutions", nargs="+", default=["1280x720", "1920x1080"])
+    parser.add_argument("--imgsz", type=int, default=640, help="input size of the per-ROI mode")
+    parser.add_argument("--frame-sizes", type=int, nargs="+", default=[640, 960, 1280],
+                        help="input sizes of the full-frame mode")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--confidence", type=float, default=0.5)
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.model):
+        print(f"[ERROR] Model not found: {args.model}")
+        return 1
+
+    detector = YOLODetector(model_path=args.model, confidence=args.confidence, imgsz=args.imgsz,
+                            backend=args.backend)
+    images = load_labeled_images(args.images)
+    print(f"[INFO] {len(images)} images, model has {len(detector.names)} classes")
+
+    print(f"{'frame':>10} {'mode':>12} {'found':>7} {'p50 ms':>8} {'p95 ms':>8}")
+    for res in args.resolutions:
+        width, height = (int(v) for v in res.split("x"))
+        frames = make_frames(images, width, height)
+        rois = get_default_rois(width, height)
+        modes = [(f"roi@{args.imgsz}", DetectionPipeline(None, detector, rois, width, height))]
+        for size in args.frame_sizes:
+            modes.append((f"frame@{size}", DetectionPipeline(None, detector, rois, width, height,
+                                                             full_frame=True, frame_imgsz=size)))
+        for name, pipeline in modes:
+            times, found = run_mode(pipeline, frames, args.repeat)
+            p50, p95 = np.percentile(times, [50, 95]) * 1e3
+            print(f"{res:>10} {name:>12} {found:>3}/{2 * len(frames):<3} {p50:>8.1f} {p95:>8.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+# bench/bench_detector.py
+# Accuracy and latency of YOLODetector across input sizes on the sign images in media/
+# (the file name is the expected label, e.g. media/ram.jpg -> "ram").
+# Run from the repo root:  python -m bench.bench_detector [--model model/best.pt] [--sizes 320 416 640]
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from cv.frame_source import IMAGE_EXTS
+from cv.inference_backends import BACKENDS
+from cv.yolo_detector import YOLODetector
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_labeled_images(folder):
+    """
+    (label, image) pairs. Images directly in folder are labeled by their file
+    name (media/ram.jpg -> "ram"), images in a subfolder by the subfolder name
+    (crops/ram/0001.jpg -> "ram"), so captured crops can be sorted into one
+    folder per sign.
+    """
+    images = []
+    for name in sorted(os.listdir(folder)):
+        path = os.path.join(folder, name)
+        if os.path.isdir(path):
+            files = [(name.lower(), os.path.join(path, f)) for f in sorted(os.listdir(path))
+                     if f.lower().endswith(IMAGE_EXTS)]
+        elif name.lower().endswith(IMAGE_EXTS):
+            files = [(os.path.splitext(name)[0].lower(), path)]
+        else:
+            continue
+        for label, file in files:
+            img = cv2.imread(file, cv2.IMREAD_COLOR)
+            if img is None:
+                print(f"[WARN] Cannot read {file}, skipped")
+                continue
+            images.append((label, img))
+    return images
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="YOLODetector accuracy/latency per input size")
+    parser.add_argument("--model", default=os.path.join(BASE_DIR, "model", "best.pt"))
+    parser.add_argument("--backend", default="auto", choices=BACKENDS)
+    parser.add_argument("--images", default=os.path.join(BASE_DIR, "media"))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[320, 416, 640])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--confidence", type=float, default=0.5)
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.model):
+        print(f"[ERROR] Model not found: {args.model}")
+        return 1
+
+    detector = YOLODetector(model_path=args.model, confidence=args.confidence, backend=args.backend)
+    images = load_labeled_images(args.images)
+    print(f"[INFO] {len(images)} images, model has {len(detector.names)} classes")
+
+    print(f"{'imgsz':>6} {'top-1':>7} {'mean conf':>10} {'p50 ms':>8} {'p95 ms':>8}")
+    for size in args.sizes:
+        detector.detect(images[0][1], imgsz=size)  # warm-up (buffers for this size)
+
+        correct = 0
+        confs = []
+        times = []
+        for label, img in images:
+            for _ in range(args.repeat):
+                t0 = time.perf_counter()
+                best = detector.detect_top1([img], imgsz=size)[0]
+                times.append(time.perf_counter() - t0)
+            if best is not None and best["label"].lower() == label:
+                correct += 1
+                confs.append(best["conf"])
+
+        p50, p95 = np.percentile(times, [50, 95]) * 1e3
+        mean_conf = np.mean(confs) if confs else 0.0
+        print(f"{size:>6} {correct:>3}/{len(images):<3} {mean_conf:>10.2f} {p50:>8.1f} {p95:>8.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
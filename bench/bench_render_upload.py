@@ -0,0 +1,61 @@
+# bench/bench_render_upload.py
+# Per-frame cost of getting a 1280x720 BGR camera frame onto the pygame screen:
+# legacy (cvtColor + rot90 + flip + make_surface + blit) vs Renderer.upload_frame.
+# Run from the repo root:  python -m bench.bench_render_upload
+# Uses SDL's dummy video driver unless SDL_VIDEODRIVER is already set.
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import cv2
+import numpy as np
+import pygame
+
+from ui.renderer import Renderer
+
+WIDTH, HEIGHT = 1280, 720
+
+
+def legacy_upload(screen, frame):
+    frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    frame = np.rot90(frame)
+    frame = cv2.flip(frame, 0)
+    surface = pygame.surfarray.make_surface(frame)
+    if surface.get_size() != screen.get_size():
+        surface = pygame.transform.scale(surface, screen.get_size())
+    screen.blit(surface, (0, 0))
+
+
+def time_it(fn, repeat=200):
+    fn()
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) / repeat * 1e3
+
+
+def main():
+    renderer = Renderer(width=WIDTH, height=HEIGHT)
+    rng = np.random.default_rng(0)
+
+    print(f"{'frame':>10} {'legacy ms':>10} {'upload ms':>10}")
+    for w, h in ((WIDTH, HEIGHT), (640, 360)):
+        frame = rng.integers(0, 256, (h, w, 3), dtype=np.uint8)
+        t_legacy = time_it(lambda: legacy_upload(renderer.screen, frame))
+        t_new = time_it(lambda: renderer.upload_frame(frame))
+        print(f"{w}x{h:<5} {t_legacy:>10.3f} {t_new:>10.3f}")
+
+    # both paths must show the same pixels
+    frame = rng.integers(0, 256, (HEIGHT, WIDTH, 3), dtype=np.uint8)
+    legacy_upload(renderer.screen, frame)
+    a = pygame.surfarray.array3d(renderer.screen).copy()
+    renderer.upload_frame(frame)
+    b = pygame.surfarray.array3d(renderer.screen)
+    print("identical output:", bool((a == b).all()))
+
+    renderer.quit()
+
+
+if __name__ == "__main__":
+    main()
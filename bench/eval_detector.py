@@ -0,0 +1,93 @@
+# bench/eval_detector.py
+# Offline evaluation of detector variants (e.g. best.pt vs best.onnx vs best_int8.onnx)
+# over a labeled folder: per-class precision/recall of the top-1 detection and p50/p95 latency.
+# Labels come from file names (media/ram.jpg) or subfolders (crops/ram/0001.jpg).
+# Run from the repo root:
+#   python -m bench.eval_detector --model model/best.pt model/best_int8.onnx [--images media]
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+from bench.bench_detector import load_labeled_images
+from cv.inference_backends import BACKENDS
+from cv.yolo_detector import YOLODetector
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def evaluate(detector, images, imgsz=None, repeat=1):
+    """Returns (predictions, latencies in seconds); a prediction is the top-1 label or None."""
+    detector.detect(images[0][1], imgsz=imgsz)  # warm-up (buffers, lazy init)
+    predictions = []
+    times = []
+    for _, img in images:
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            best = detector.detect_top1([img], imgsz=imgsz)[0]
+            times.append(time.perf_counter() - t0)
+        predictions.append(best["label"].lower() if best is not None else None)
+    return predictions, times
+
+
+def per_class_scores(labels, predictions):
+    """{class: (tp, fp, fn)} over the true and predicted classes."""
+    classes = sorted(set(labels) | {p for p in predictions if p is not None})
+    scores = {}
+    for c in classes:
+        tp = sum(1 for l, p in zip(labels, predictions) if l == c and p == c)
+        fp = sum(1 for l, p in zip(labels, predictions) if l != c and p == c)
+        fn = sum(1 for l, p in zip(labels, predictions) if l == c and p != c)
+        scores[c] = (tp, fp, fn)
+    return scores
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-class precision/recall and latency of detector variants")
+    parser.add_argument("--model", nargs="+", default=[os.path.join(BASE_DIR, "model", "best.pt")])
+    parser.add_argument("--backend", default="auto", choices=BACKENDS)
+    parser.add_argument("--images", default=os.path.join(BASE_DIR, "media"))
+    parser.add_argument("--imgsz", type=int, default=640)
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per image")
+    parser.add_argument("--confidence", type=float, default=0.5)
+    parser.add_argument("--threads", type=int, default=None, help="ONNX Runtime intra-op threads")
+    args = parser.parse_args(argv)
+
+    images = load_labeled_images(args.images)
+    if not images:
+        print(f"[ERROR] No labeled images in: {args.images}")
+        return 1
+    labels = [label for label, _ in images]
+    print(f"[INFO] {len(images)} images, {len(set(labels))} classes")
+
+    summary = []
+    for model_path in args.model:
+        if not os.path.exists(model_path):
+            print(f"[ERROR] Model not found: {model_path}")
+            return 1
+        detector = YOLODetector(model_path=model_path, confidence=args.confidence, imgsz=args.imgsz,
+                                backend=args.backend, threads=args.threads)
+        predictions, times = evaluate(detector, images, args.imgsz, args.repeat)
+        p50, p95 = np.percentile(times, [50, 95]) * 1e3
+        correct = sum(1 for l, p in zip(labels, predictions) if l == p)
+        summary.append((os.path.basename(model_path), correct, p50, p95))
+
+        print(f"\n{model_path}")
+        print(f"{'class':>12} {'precision':>10} {'recall':>8} {'tp':>4} {'fp':>4} {'fn':>4}")
+        for c, (tp, fp, fn) in per_class_scores(labels, predictions).items():
+            precision = tp / (tp + fp) if tp + fp else 0.0
+            recall = tp / (tp + fn) if tp + fn else 0.0
+            print(f"{c:>12} {precision:>10.2f} {recall:>8.2f} {tp:>4} {fp:>4} {fn:>4}")
+        print(f"top-1 {correct}/{len(images)}, p50 {p50:.1f} ms, p95 {p95:.1f} ms")
+
+    if len(summary) > 1:
+        print(f"\n{'model':>24} {'top-1':>7} {'p50 ms':>8} {'p95 ms':>8}")
+        for name, correct, p50, p95 in summary:
+            print(f"{name:>24} {correct:>3}/{len(images):<3} {p50:>8.1f} {p95:>8.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,29 @@
+import time
+
+
+class RealClock:
+    """Wall-clock time (what every timer used before clocks were injectable)."""
+    def now(self):
+        return time.time()
+
+
+class ManualClock:
+    """
+    Stepped clock for simulations and tests: time only moves when advance()
+    is called, so a match can run as fast as the CPU allows and replay exactly.
+    """
+    def __init__(self, start=0.0):
+        self._t = float(start)
+
+    def now(self):
+        return self._t
+
+    def advance(self, dt):
+        self._t += float(dt)
+        return self._t
+
+    def set(self, t):
+        self._t = float(t)
+
+
+REAL_CLOCK = RealClock()
@@ -2,7 +2,9 @@ from enum import Enum
 from core.player import Player
 from cv.roi import get_default_rois
 from logic.combat import CombatManager
-from logic.abilities import check_combo, AbilityType
+from logic.combat_vectorized import VectorizedCombatManager
+from logic.abilities import AbilityType
+from core.clock import REAL_CLOCK, ManualClock
 
 class GameState(Enum):
     START = 1
@@ -10,15 +12,56 @@ class GameState(Enum):
     GAME_OVER = 3
 
 class GameManager:
-    def __init__(self, frame_width=1280, frame_height=720):
+    def __init__(self, frame_width=1280, frame_height=720, clock=None, combat_engine="classic",
+                 sim_rate=120, max_frame_dt=0.25):
+        # Two time bases:
+        # - simulation time: combat (projectiles and wall lifetimes) and cooldowns only
+        #   move by the fixed steps advance() runs, so a clamped stall pauses them alike;
+        # - self.clock: input timing (stabilizer window, combo window) and VFX, which
+        #   follow when signs were actually seen. advance() moves a ManualClock by the
+        #   same frame_dt, so a stepped run needs no second call.
+        self.clock = clock or REAL_CLOCK
         self.state = GameState.START
         rois = get_default_rois(frame_width, frame_height)
         self.players = {
-            1: Player(1, rois[0]),
-            2: Player(2, rois[1])
+            1: Player(1, rois[0], clock=self.clock),
+            2: Player(2, rois[1], clock=self.clock)
         }
-        self.combat_manager = CombatManager()
+        # "vectorized" keeps projectiles in NumPy arrays (scales to hundreds of projectiles)
+        if combat_engine == "vectorized":
+            self.combat_manager = VectorizedCombatManager()
+        elif combat_engine == "classic":
+            self.combat_manager = CombatManager()
+        else:
+            raise ValueError(f"Unknown combat engine: {combat_engine}")
         self.winner = None
+        self._last_detection_seq = None
+
+        # fixed-timestep simulation: advance() feeds frame time into an accumulator
+        # and runs update() in sim_step slices, whatever the render/inference rate
+        self.sim_step = 1.0 / sim_rate
+        self.max_frame_dt = max_frame_dt  # longer frames (stalls) are clamped, not replayed
+        self._accumulator = 0.0
+        self.sim_steps = 0
+        self.dropped_sim_time = 0.0
+
+    def advance(self, frame_dt):
+        """Run as many fixed steps as frame_dt allows. Returns the number of steps run."""
+        if isinstance(self.clock, ManualClock):
+            self.clock.advance(frame_dt)  # the input/VFX clock sees the unclamped frame time
+        if frame_dt > self.max_frame_dt:
+            self.dropped_sim_time += frame_dt - self.max_frame_dt
+            frame_dt = self.max_frame_dt
+        self._accumulator += frame_dt
+
+        steps = 0
+        while self._accumulator >= self.sim_step:
+            self.update(self.sim_step)
+            self._accumulator -= self.sim_step
+            steps += 1
+
+        self.sim_steps += steps
+        return steps
 
     def update(self, dt):
         if self.state == GameState.PLAYING:
@@ -37,7 +80,7 @@ class GameManager:
                 self.winner = 1
                 self.state = GameState.GAME_OVER
 
-    def process_hand_sign(self, player_id, sign):
+    def process_hand_sign(self, player_id, sign, conf=1.0):
         if self.state != GameState.PLAYING:
             return
 
@@ -46,15 +89,37 @@ class GameManager:
             return
 
         player.current_sign = sign
-        stabilized_sign = player.stabilizer.update(sign)
+        stabilized_sign = player.stabilizer.update(sign, conf)
         if stabilized_sign:
-            player.input_buffer.add_sign(stabilized_sign)
-            sequence = player.input_buffer.get_sequence()
-            ability = check_combo(sequence)
-            
+            # advances the player's combo state; resets itself on a match
+            ability = player.combo_matcher.push(stabilized_sign)
             if ability:
                 self.trigger_ability(player, ability)
-                player.input_buffer.clear()
+
+    def consume_detections(self, pipeline):
+        # Non-blocking: feeds the newest async detection result (once) to process_hand_sign.
+        # Returns the result when it was new, otherwise None.
+        if self.state != GameState.PLAYING:
+            return None
+
+        result = pipeline.get_latest()
+        if result is None:
+            # detection stalled past its staleness bound: drop the held signs once
+            if self._last_detection_seq is not None:
+                self._last_detection_seq = None
+                for player_id in self.players:
+                    self.process_hand_sign(player_id, None)
+            return None
+
+        if result.seq == self._last_detection_seq:
+            return None
+        self._last_detection_seq = result.seq
+
+        for player_id in self.players:
+            best = result.detections.get(player_id)
+            conf = best["conf"] if best else 1.0
+            self.process_hand_sign(player_id, result.signs.get(player_id), conf)
+        return result
 
     def trigger_ability(self, player, ability):
         if player.can_cast(ability):
@@ -79,6 +144,8 @@ class GameManager:
         self.combat_manager.projectiles = []
         self.combat_manager.walls = []
         self.winner = None
+        self._last_detection_seq = None
+        self._accumulator = 0.0
         self.state = GameState.PLAYING
 
     def reset_to_start(self):
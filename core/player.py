@@ -1,16 +1,17 @@
-import time
 from logic.stabilizer import Stabilizer
-from logic.input_buffer import InputBuffer
+from logic.combo_matcher import ComboMatcher
 from logic.abilities import AbilityType, COOLDOWNS
+from core.clock import REAL_CLOCK
 
 class Player:
-    def __init__(self, player_id, roi):
+    def __init__(self, player_id, roi, clock=None):
+        self.clock = clock or REAL_CLOCK
         self.player_id = player_id
         self.roi = roi
         self.hp = 100
         self.max_hp = 100
-        self.stabilizer = Stabilizer()
-        self.input_buffer = InputBuffer()
+        self.stabilizer = Stabilizer(clock=self.clock)
+        self.combo_matcher = ComboMatcher(clock=self.clock)
         self.cooldowns = {
             AbilityType.FIREBALL: 0,
             AbilityType.WALL: 0,
@@ -41,6 +42,7 @@ class Player:
 
     def reset(self):
         self.hp = 100
-        self.input_buffer.clear()
+        self.combo_matcher.clear()
+        self.stabilizer.reset()
         for ability in self.cooldowns:
             self.cooldowns[ability] = 0
@@ -1,14 +1,45 @@
+import threading
+import time
+from collections import deque
+
 import cv2
 
-class Camera:
-    def __init__(self, camera_id=0, width=1280, height=720):
+from cv.frame_source import FrameSource
+
+class Camera(FrameSource):
+    """
+    Webcam wrapper.
+
+    threaded=False: get_frame() reads synchronously (original behaviour).
+    threaded=True: a background thread keeps reading and only the newest
+    frames are kept in a small ring buffer, so the game loop never waits on
+    the webcam and never sees stale queued frames.
+    """
+    def __init__(self, camera_id=0, width=1280, height=720, threaded=False, buffer_size=2):
         self.cap = cv2.VideoCapture(camera_id)
         self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
         self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
         self.width = width
         self.height = height
 
-    def get_frame(self):
+        self.threaded = threaded
+        self._ring = deque(maxlen=max(1, int(buffer_size)))  # (frame, timestamp, seq)
+        self._lock = threading.Lock()
+        self._new_frame = threading.Condition(self._lock)
+        self._seq = 0
+        self._consumed_seq = 0
+        self._running = False
+        self._thread = None
+        self._on_capture = None
+
+        # stats
+        self.frames_captured = 0
+        self.dropped_frames = 0  # captured frames overwritten before anyone read them
+
+        if self.threaded:
+            self.start()
+
+    def _read(self):
         ret, frame = self.cap.read()
         if not ret:
             return None
@@ -16,5 +47,92 @@ class Camera:
         frame = cv2.flip(frame, 1)
         return frame
 
+    # ---------------------------
+    # Threaded capture
+    # ---------------------------
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._capture_loop, name="camera-capture", daemon=True)
+        self._thread.start()
+
+    def _capture_loop(self):
+        while self._running:
+            frame = self._read()
+            if frame is None:
+                break
+
+            ts = time.time()
+            # consumers get read-only views; the next read allocates a new array
+            frame.flags.writeable = False
+
+            with self._lock:
+                self._seq += 1
+                if self._ring and self._ring[-1][2] > self._consumed_seq:
+                    self.dropped_frames += 1
+                self._ring.append((frame, ts, self._seq))
+                self.frames_captured += 1
+                self._new_frame.notify_all()
+                on_capture = self._on_capture
+
+            if on_capture is not None:
+                on_capture(frame, ts)
+
+        with self._lock:
+            self._running = False
+            self._new_frame.notify_all()
+
+    def get_latest(self):
+        """
+        Non-blocking. Returns (frame, timestamp, seq) for the newest captured
+        frame, or (None, None, 0) if nothing has been captured yet.
+        The returned frame is read-only; copy it before drawing on it.
+        """
+        with self._lock:
+            if not self._ring:
+                return None, None, 0
+            frame, ts, seq = self._ring[-1]
+            if seq > self._consumed_seq:
+                self._consumed_seq = seq
+            return frame, ts, seq
+
+    def set_capture_listener(self, listener):
+        """Threaded capture only: listener(frame, timestamp) runs on the capture thread for every frame."""
+        if not self.threaded:
+            return False
+        with self._lock:
+            self._on_capture = listener
+        return True
+
+    def is_running(self):
+        return self._running
+
+    # ---------------------------
+    # Public API
+    # ---------------------------
+    def get_frame(self, timeout=1.0):
+        if not self.threaded:
+            return self._read()
+
+        # Only waits before the very first frame arrives (or if capture died)
+        with self._lock:
+            if not self._ring:
+                self._new_frame.wait_for(lambda: self._ring or not self._running, timeout=timeout)
+            if not self._ring:
+                return None
+
+            frame, _, seq = self._ring[-1]
+            if not self._running and seq <= self._consumed_seq:
+                # capture ended and the last frame was already handed out
+                return None
+            self._consumed_seq = max(self._consumed_seq, seq)
+
+        return frame.copy()
+
     def release(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
         self.cap.release()
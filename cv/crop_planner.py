@@ -0,0 +1,57 @@
+class CropPlanner:
+    """
+    Picks the inference crop for each player's ROI. With a recent hand box it
+    returns a square crop around it (the box plus padding times its size on
+    every side, at least min_size), clipped to the ROI; without one, or once
+    the hand was missed in a tight crop, it falls back to the full ROI.
+
+    Hints come from the detector (report()) and optionally from a hand tracker
+    (set_hint()); the newest one wins.
+    """
+    def __init__(self, padding=0.6, min_size=192, max_hint_age=1.0):
+        self.padding = padding
+        self.min_size = min_size
+        self.max_hint_age = max_hint_age
+        self._hints = {}  # player_id -> (bbox frame coords, timestamp)
+
+        # stats
+        self.tight_crops = 0
+        self.full_crops = 0
+
+    def set_hint(self, player_id, bbox, ts):
+        self._hints[player_id] = (tuple(bbox), ts)
+
+    def clear(self, player_id=None):
+        if player_id is None:
+            self._hints.clear()
+        else:
+            self._hints.pop(player_id, None)
+
+    def plan(self, player_id, roi_box, now):
+        """Crop box (x1, y1, x2, y2) in frame coords, inside roi_box."""
+        hint = self._hints.get(player_id)
+        if hint is None or now - hint[1] > self.max_hint_age:
+            self.full_crops += 1
+            return roi_box
+
+        rx1, ry1, rx2, ry2 = roi_box
+        bx1, by1, bx2, by2 = hint[0]
+        side = max(bx2 - bx1, by2 - by1) * (1 + 2 * self.padding)
+        side = min(max(side, self.min_size), rx2 - rx1, ry2 - ry1)
+        if side >= min(rx2 - rx1, ry2 - ry1):
+            self.full_crops += 1
+            return roi_box
+
+        cx, cy = (bx1 + bx2) / 2, (by1 + by2) / 2
+        x1 = int(min(max(cx - side / 2, rx1), rx2 - side))
+        y1 = int(min(max(cy - side / 2, ry1), ry2 - side))
+        self.tight_crops += 1
+        return x1, y1, x1 + int(side), y1 + int(side)
+
+    def report(self, player_id, best, ts):
+        """Feed back the crop's top detection (frame coords) or None."""
+        if best is not None and best.get("bbox") is not None:
+            self.set_hint(player_id, best["bbox"], ts)
+        else:
+            # missed (maybe the hand left a tight crop): look at the whole ROI next
+            self.clear(player_id)
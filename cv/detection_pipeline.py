@@ -0,0 +1,361 @@
+import threading
+import time
+
+import numpy as np
+
+
+class DetectionResult:
+    """Per-player sign results for one captured frame."""
+    def __init__(self, seq, capture_ts, done_ts, signs, hand_centers, detections, inferred=None, frame=None):
+        self.seq = seq
+        self.capture_ts = capture_ts
+        self.done_ts = done_ts
+        self.signs = signs                # {player_id: label or None}
+        self.hand_centers = hand_centers  # {player_id: (x, y) frame coords or None}
+        self.detections = detections      # {player_id: best detection dict (bbox in frame coords) or None}
+        self.inferred = inferred if inferred is not None else set(detections)  # players run through the detector
+        self.frame = frame                # the (read-only) frame the boxes were detected in
+
+    def age(self, now=None):
+        now = time.time() if now is None else now
+        return now - self.capture_ts
+
+
+def clip_roi(roi, frame_width, frame_height):
+    rx1, ry1 = max(0, int(roi.x)), max(0, int(roi.y))
+    rx2, ry2 = min(frame_width, int(roi.x + roi.w)), min(frame_height, int(roi.y + roi.h))
+    if rx2 <= rx1 or ry2 <= ry1:
+        return None
+    return rx1, ry1, rx2, ry2
+
+
+def detection_in_frame(detection, rx1, ry1):
+    """A crop's detection (or None) with its bbox shifted back to frame coordinates."""
+    if detection is None:
+        return None
+    detection = dict(detection)
+    if detection.get("bbox") is not None:
+        bx1, by1, bx2, by2 = detection["bbox"]  # xyxy ROI coords
+        detection["bbox"] = (rx1 + bx1, ry1 + by1, rx1 + bx2, ry1 + by2)
+    return detection
+
+
+def assign_to_rois(detections, rois):
+    """
+    Index of the best detection per player among those whose box center
+    lies in its ROI (ROI.contains, on the whole array at once), or None.
+    detections is a YOLODetector DETECTION_DTYPE array.
+    """
+    d = detections
+    best = {}
+    for roi in rois:
+        inside = np.flatnonzero(roi.contains(d["x1"], d["y1"], d["x2"] - d["x1"], d["y2"] - d["y1"]))
+        best[roi.player_id] = int(inside[np.argmax(detections["conf"][inside])]) if len(inside) else None
+    return best
+
+
+def input_size_for(crops, stride=32, max_size=640):
+    # smallest stride multiple holding the largest crop, so tight crops aren't upscaled to max_size
+    side = max(max(c.shape[0], c.shape[1]) for c in crops)
+    return min(max_size, -(-side // stride) * stride)
+
+
+def bbox_center(bbox):
+    x1, y1, x2, y2 = bbox
+    return (int((x1 + x2) / 2), int((y1 + y2) / 2))
+
+
+class _FramePlan:
+    """What a frame runs through the detector (see DetectionPipeline._plan)."""
+    def __init__(self, t0, frame):
+        self.t0 = t0
+        self.frame = frame
+        self.crops = []       # crop views into the frame
+        self.crop_boxes = []  # (player_id, ROI box..., crop box...) per crop, frame coords
+        self.thumbs = []      # motion-gate thumbnails of the inferred ROIs
+        self.reused = []      # (player_id, ROI box...) of ROIs reusing their last detection
+        self.imgsz = None
+
+
+class DetectionPipeline:
+    """
+    Runs YOLO on the player ROIs of the newest camera frame on a worker
+    thread (or a detector pool), decoupled from the render loop.
+    """
+    def __init__(self, camera, detector, rois, frame_width, frame_height,
+                 max_staleness=0.5, idle_sleep=0.002, motion_gate=None, crop_planner=None,
+                 roi_imgsz=None, pool=None, full_frame=False, frame_imgsz=None):
+        if full_frame and pool is not None:
+            raise ValueError("Full-frame detection runs in-process, not on a detector pool")
+        self.camera = camera
+        self.detector = detector  # may be None with a pool
+        self.pool = pool          # DetectorPool (cv/detector_pool.py): inference in worker processes
+        self.full_frame = full_frame    # one pass over the whole frame instead of one crop per ROI
+        self.frame_imgsz = frame_imgsz  # input size of that pass (default the detector's imgsz)
+        self.rois = list(rois)
+        self.frame_width = frame_width
+        self.frame_height = frame_height
+        self.max_staleness = float(max_staleness)  # older frames aren't run, older results aren't returned
+        self.idle_sleep = float(idle_sleep)
+        self.motion_gate = motion_gate    # unchanged ROIs reuse their last detection (cv/motion_gate.py)
+        self.crop_planner = crop_planner  # tight crops around recent hand boxes (cv/crop_planner.py), ROI mode only
+        self.roi_imgsz = dict(roi_imgsz or {})  # player_id -> input size; a batch runs at its largest
+        self._reused = {}  # player_id -> best detection (frame coords) or None, from the last inference
+
+        self._lock = threading.Lock()
+        self._latest = None
+        self._enabled = threading.Event()
+        self._running = False
+        self._thread = None
+        self.error = None  # set when the detector pool fails; no more results will come
+
+        # stats
+        self.inferences = 0
+        self.skipped_frames = 0  # captured while an inference was running
+        self.stale_frames = 0    # older than max_staleness when the worker got to them
+        self.late_frames = 0     # pool frames dropped for finishing after a newer one
+        self.last_latency = 0.0
+        self.roi_inferences = 0
+        self.skipped_inferences = 0  # ROIs that reused their detection (no motion)
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        target = self._worker if self.pool is None else self._pool_worker
+        self._thread = threading.Thread(target=target, name="detection-worker", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        self._enabled.set()  # wake the worker so it can exit
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def set_enabled(self, enabled):
+        if enabled:
+            self._enabled.set()
+        else:
+            self._enabled.clear()
+            with self._lock:
+                self._latest = None
+                if self.motion_gate is not None:
+                    self.motion_gate.reset()
+                if self.crop_planner is not None:
+                    self.crop_planner.clear()
+
+    def _worker(self):
+        last_seq = 0
+        while self._running:
+            if not self._enabled.wait(timeout=0.1):
+                continue
+
+            frame, capture_ts, seq = self.camera.get_latest()
+            if frame is None or seq == last_seq:
+                time.sleep(self.idle_sleep)
+                continue
+
+            if last_seq:
+                self.skipped_frames += max(0, seq - last_seq - 1)
+            last_seq = seq
+
+            if time.time() - capture_ts > self.max_staleness:
+                self.stale_frames += 1
+                continue
+
+            result = self.run_once(frame, capture_ts, seq)
+            if not self._enabled.is_set():
+                continue
+
+            with self._lock:
+                self._latest = result
+
+    def _pool_worker(self):
+        last_seq = 0
+        newest = 0  # newest frame seq finished so far
+        plans = {}  # seq -> (plan, capture_ts) of frames in the pool
+        while self._running:
+            if not self._enabled.wait(timeout=0.1):
+                continue
+
+            full = self.pool.in_flight() >= self.pool.slots
+            try:
+                completed = self.pool.poll(timeout=self.idle_sleep if full else 0.0)
+            except RuntimeError as e:
+                print(f"[ERROR] Detection stopped: {e}")
+                self.error = str(e)
+                self._running = False
+                break
+            for seq, detections, _ in completed:
+                plan, capture_ts = plans.pop(seq)
+                if seq < newest:
+                    # finished after a newer frame: its gate thumbnails, reused detections and
+                    # crop hints would overwrite newer ones, so drop it
+                    self.late_frames += 1
+                    continue
+                newest = seq
+                top1 = [detections.get(box[0]) for box in plan.crop_boxes]
+                result = self._finish(plan, top1, capture_ts, seq)
+                with self._lock:
+                    if self._enabled.is_set():
+                        self._latest = result
+            if full:
+                continue
+
+            frame, capture_ts, seq = self.camera.get_latest()
+            if frame is None or seq == last_seq:
+                time.sleep(self.idle_sleep)
+                continue
+
+            if last_seq:
+                self.skipped_frames += max(0, seq - last_seq - 1)
+            last_seq = seq
+
+            if time.time() - capture_ts > self.max_staleness:
+                self.stale_frames += 1
+                continue
+
+            plan = self._plan(frame, time.time())
+            jobs = [(box[0], box[5:]) for box in plan.crop_boxes]
+            if self.pool.submit(frame, seq, jobs, plan.imgsz):
+                plans[seq] = (plan, capture_ts)
+
+    def run_once(self, frame, capture_ts, seq):
+        """Synchronous detection of every ROI in one frame (one batched forward pass)."""
+        if self.full_frame:
+            return self._run_full_frame(frame, capture_ts, seq)
+        plan = self._plan(frame, time.time())
+        top1 = self.detector.detect_top1(plan.crops, imgsz=plan.imgsz) if plan.crops else []
+        return self._finish(plan, top1, capture_ts, seq)
+
+    def _default_imgsz(self):
+        return getattr(self.detector if self.detector is not None else self.pool, "imgsz", 640)
+
+    def _plan(self, frame, t0):
+        """Motion gating and crop planning for one frame: which crops to run, at which imgsz."""
+        plan = _FramePlan(t0, frame)
+        all_tight = self.crop_planner is not None
+        for roi in self.rois:
+            box = clip_roi(roi, self.frame_width, self.frame_height)
+            if box is None:
+                continue
+            rx1, ry1, rx2, ry2 = box
+            crop = frame[ry1:ry2, rx1:rx2]
+
+            if self.motion_gate is not None:
+                changed, thumb = self.motion_gate.check(roi.player_id, crop, t0)
+                if not changed and roi.player_id in self._reused:
+                    plan.reused.append((roi.player_id, rx1, ry1, rx2, ry2))
+                    continue
+                plan.thumbs.append(thumb)
+
+            cx1, cy1, cx2, cy2 = box
+            if self.crop_planner is not None:
+                cx1, cy1, cx2, cy2 = self.crop_planner.plan(roi.player_id, box, t0)
+                crop = frame[cy1:cy2, cx1:cx2]
+                all_tight = all_tight and (cx1, cy1, cx2, cy2) != box
+
+            plan.crops.append(crop)
+            plan.crop_boxes.append((roi.player_id, rx1, ry1, rx2, ry2, cx1, cy1, cx2, cy2))
+
+        if self.roi_imgsz and plan.crops:
+            default = self._default_imgsz()
+            plan.imgsz = max(self.roi_imgsz.get(box[0], default) for box in plan.crop_boxes)
+        if all_tight and plan.crops:
+            # a full ROI in the batch keeps the configured input size
+            plan.imgsz = input_size_for(plan.crops, max_size=plan.imgsz or self._default_imgsz())
+        return plan
+
+    def _run_full_frame(self, frame, capture_ts, seq):
+        """One pass over the whole frame; each player gets the best detection centered in their ROI."""
+        plan = _FramePlan(time.time(), frame)
+        rois = []
+        boxes = []
+        changed = self.motion_gate is None
+        for roi in self.rois:
+            box = clip_roi(roi, self.frame_width, self.frame_height)
+            if box is None:
+                continue
+            rois.append(roi)
+            boxes.append((roi.player_id, box))
+            if self.motion_gate is not None:
+                rx1, ry1, rx2, ry2 = box
+                roi_changed, thumb = self.motion_gate.check(roi.player_id, frame[ry1:ry2, rx1:rx2], plan.t0)
+                changed = changed or roi_changed or roi.player_id not in self._reused
+                plan.thumbs.append(thumb)
+
+        if not changed:
+            plan.reused = [(player_id, *box) for player_id, box in boxes]
+            return self._finish(plan, [], capture_ts, seq)
+
+        h, w = frame.shape[:2]
+        detections = self.detector.detect_arrays([frame], imgsz=self.frame_imgsz)[0]
+        best = assign_to_rois(detections, rois)
+        # only the winners become dicts; the "crop" is the whole frame, so boxes are in frame coords
+        top1 = []
+        for player_id, _ in boxes:
+            i = best[player_id]
+            top1.append(None if i is None else self.detector.to_dicts(detections[i:i + 1])[0])
+        plan.crop_boxes = [(player_id, *box, 0, 0, w, h) for player_id, box in boxes]
+        return self._finish(plan, top1, capture_ts, seq)
+
+    def _finish(self, plan, top1, capture_ts, seq):
+        """Builds the DetectionResult from the top-1 detection (crop coords) of each planned crop."""
+        t0 = plan.t0
+        crop_boxes, reused = plan.crop_boxes, plan.reused
+        self.roi_inferences += len(crop_boxes)
+        self.skipped_inferences += len(reused)
+
+        best_by_player = {roi.player_id: None for roi in self.rois}
+        for i, ((player_id, *_, cx1, cy1, _, _), detection) in enumerate(zip(crop_boxes, top1)):
+            best = detection_in_frame(detection, cx1, cy1)
+            best_by_player[player_id] = best
+            if self.crop_planner is not None:
+                self.crop_planner.report(player_id, best, t0)
+            if self.motion_gate is not None:
+                self.motion_gate.mark(player_id, plan.thumbs[i], t0)
+                self._reused[player_id] = best
+        for player_id, *_ in reused:
+            best_by_player[player_id] = self._reused[player_id]
+
+        signs = {roi.player_id: None for roi in self.rois}
+        hand_centers = {roi.player_id: None for roi in self.rois}
+        for player_id, rx1, ry1, rx2, ry2, *_ in crop_boxes + reused:
+            best = best_by_player[player_id]
+            if best is None:
+                continue
+
+            signs[player_id] = best.get("label")
+            if best.get("bbox") is not None:
+                hand_centers[player_id] = bbox_center(best["bbox"])
+            else:
+                hand_centers[player_id] = bbox_center((rx1, ry1, rx2, ry2))
+
+        done_ts = time.time()
+        if crop_boxes:
+            self.inferences += 1
+            self.last_latency = done_ts - t0
+        inferred = {box[0] for box in crop_boxes}
+        return DetectionResult(seq, capture_ts, done_ts, signs, hand_centers, best_by_player, inferred,
+                               frame=plan.frame)
+
+    def set_hand_hint(self, player_id, bbox):
+        """Hand box (frame coords) from a tracker, used to plan the next tight crop."""
+        if self.crop_planner is not None:
+            self.crop_planner.set_hint(player_id, bbox, time.time())
+
+    def request_refresh(self, player_id):
+        """Run the detector on this player's ROI at the next frame even if it didn't change."""
+        if self.motion_gate is not None:
+            self.motion_gate.invalidate(player_id)
+
+    def get_latest(self, now=None):
+        """Non-blocking. Newest result, or None if there is none or it is too stale."""
+        with self._lock:
+            result = self._latest
+        if result is None:
+            return None
+        if result.age(now) > self.max_staleness:
+            return None
+        return result
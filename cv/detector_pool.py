@@ -0,0 +1,242 @@
+import multiprocessing as mp
+import os
+import queue
+import time
+from collections import deque
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+class SharedFrameRing:
+    """
+    slots fixed-size frame buffers (uint8, up to max_shape) in one
+    multiprocessing.shared_memory block. The pool writes a frame into a free
+    slot once; workers read their crops straight out of it, so frames are
+    never pickled.
+    """
+    def __init__(self, slots, max_shape, name=None):
+        self.slots = slots
+        self.slot_bytes = int(np.prod(max_shape))
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=slots * self.slot_bytes)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.name = self.shm.name
+
+    def view(self, slot, shape):
+        return np.ndarray(shape, dtype=np.uint8, buffer=self.shm.buf, offset=slot * self.slot_bytes)
+
+    def write(self, slot, frame):
+        if frame.nbytes > self.slot_bytes:
+            raise ValueError(f"Frame {frame.shape} does not fit a ring slot ({self.slot_bytes} bytes)")
+        self.view(slot, frame.shape)[...] = frame
+
+    def close(self):
+        self.shm.close()
+
+    def unlink(self):
+        self.shm.unlink()
+
+
+def limit_threads(threads):
+    """Caps torch/OpenCV (and BLAS/OpenMP) threads in the current process."""
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[var] = str(threads)
+
+    import cv2
+    import torch
+
+    cv2.setNumThreads(threads)
+    torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass  # already set (inter-op pool started)
+
+
+def _worker_main(worker_id, ring_name, slots, max_shape, model_path, detector_kwargs, threads, tasks, results):
+    limit_threads(threads)
+    from cv.yolo_detector import YOLODetector
+
+    ring = SharedFrameRing(slots, max_shape, name=ring_name)
+    try:
+        detector = YOLODetector(model_path=model_path, threads=threads, **detector_kwargs)
+        results.put(("ready", worker_id, detector.imgsz, detector.names))
+
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            seq, slot, shape, jobs, imgsz = task  # jobs: [(key, (x1, y1, x2, y2))]
+            frame = ring.view(slot, shape)
+            crops = [frame[y1:y2, x1:x2] for _, (x1, y1, x2, y2) in jobs]
+            t0 = time.perf_counter()
+            try:
+                top1 = detector.detect_top1(crops, imgsz=imgsz)
+            except Exception as e:
+                print(f"[ERROR] Detector worker {worker_id}: {e}")
+                top1 = [None] * len(jobs)
+            latency = time.perf_counter() - t0
+            results.put(("done", seq, [(key, det) for (key, _), det in zip(jobs, top1)], worker_id, latency))
+    except Exception as e:
+        results.put(("failed", worker_id, repr(e)))
+    finally:
+        ring.close()
+
+
+class DetectorPool:
+    """
+    YOLODetector instances in worker processes, so inference runs outside
+    the game process (and its GIL) on several cores.
+
+    submit(frame, seq, jobs) copies the frame into a shared-memory ring slot
+    and queues its crops: with per_roi=True each crop is its own task (the
+    ROIs of one frame run in parallel on different workers), otherwise all
+    crops of a frame go to one worker as a batch (frames run in parallel).
+    poll() returns completed frames as (seq, {key: top-1 detection or None},
+    latency), in completion order; a slot is reused once all of its frame's
+    tasks are back. At most `slots` frames are in flight; submit() returns
+    False when the ring is full. A worker that dies or stops makes poll()
+    raise RuntimeError, since its frames (and ring slots) would never come back.
+
+    Each worker gets threads torch/OpenCV/ONNX Runtime threads (default: the
+    cores split evenly), so workers don't oversubscribe the machine.
+    """
+    def __init__(self, model_path, workers=2, max_shape=(720, 1280, 3), slots=None, per_roi=True,
+                 threads=None, start_timeout=120.0, **detector_kwargs):
+        self.model_path = model_path
+        self.workers = max(1, int(workers))
+        self.max_shape = tuple(max_shape)
+        self.slots = slots or self.workers + 1
+        self.per_roi = per_roi
+        self.threads = threads or max(1, (os.cpu_count() or 1) // self.workers)
+        self.start_timeout = start_timeout
+        self.detector_kwargs = detector_kwargs
+
+        self.imgsz = detector_kwargs.get("imgsz", 640)
+        self.names = {}
+        self._ring = None
+        self._procs = []
+        self._tasks = None
+        self._results = None
+        self._free = deque()
+        self._in_flight = {}  # seq -> [slot, tasks left, {key: detection}, max task latency]
+
+        # stats
+        self.submitted = 0
+        self.completed = 0
+        self.full = 0
+
+    def start(self):
+        if self._procs:
+            return
+        ctx = mp.get_context("spawn")  # fork is unsafe once torch/OpenCV threads exist
+        self._ring = SharedFrameRing(self.slots, self.max_shape)
+        self._free = deque(range(self.slots))
+        self._tasks = ctx.Queue()
+        self._results = ctx.Queue()
+        for i in range(self.workers):
+            p = ctx.Process(
+                target=_worker_main, name=f"detector-{i}", daemon=True,
+                args=(i, self._ring.name, self.slots, self.max_shape, self.model_path,
+                      self.detector_kwargs, self.threads, self._tasks, self._results),
+            )
+            p.start()
+            self._procs.append(p)
+
+        ready = 0
+        deadline = time.time() + self.start_timeout
+        while ready < self.workers:
+            try:
+                msg = self._results.get(timeout=max(0.1, deadline - time.time()))
+            except queue.Empty:
+                self.stop()
+                raise RuntimeError("Detector workers did not start in time")
+            if msg[0] == "failed":
+                self.stop()
+                raise RuntimeError(f"Detector worker {msg[1]} failed to start: {msg[2]}")
+            _, _, self.imgsz, self.names = msg
+            ready += 1
+        print(f"[INFO] Detector pool: {self.workers} workers x {self.threads} threads")
+
+    def stop(self):
+        for _ in self._procs:
+            self._tasks.put(None)
+        for p in self._procs:
+            p.join(timeout=2.0)
+            if p.is_alive():
+                p.terminate()
+        self._procs = []
+        self._in_flight.clear()
+        if self._ring is not None:
+            self._ring.close()
+            self._ring.unlink()
+            self._ring = None
+
+    def in_flight(self):
+        return len(self._in_flight)
+
+    def submit(self, frame, seq, jobs, imgsz=None):
+        """
+        Queue a frame's crops; jobs are (key, (x1, y1, x2, y2)) boxes in frame
+        coords. Returns False (nothing queued) when every slot is in use.
+        """
+        if not self._free:
+            self.full += 1
+            return False
+        if not jobs:
+            self._in_flight[seq] = [None, 0, {}, 0.0]
+            return True
+
+        slot = self._free.popleft()
+        # boxes are clipped to the pipeline's frame size (= max_shape), so a larger
+        # camera frame only loses pixels no job reads
+        frame = frame[:self.max_shape[0], :self.max_shape[1]]
+        self._ring.write(slot, frame)
+        groups = [[job] for job in jobs] if self.per_roi else [list(jobs)]
+        self._in_flight[seq] = [slot, len(groups), {}, 0.0]
+        for group in groups:
+            self._tasks.put((seq, slot, frame.shape, group, imgsz))
+        self.submitted += 1
+        return True
+
+    def _check_workers(self):
+        for i, p in enumerate(self._procs):
+            if not p.is_alive():
+                raise RuntimeError(f"Detector worker {i} died (exit code {p.exitcode})")
+
+    def poll(self, timeout=0.0):
+        """Completed frames since the last call: [(seq, {key: detection or None}, latency)]."""
+        self._check_workers()
+        done = []
+        for seq, entry in list(self._in_flight.items()):
+            if entry[1] == 0:  # submitted without crops
+                del self._in_flight[seq]
+                done.append((seq, entry[2], 0.0))
+
+        block = not done
+        while True:
+            try:
+                msg = self._results.get(timeout=timeout) if block else self._results.get_nowait()
+            except queue.Empty:
+                break
+            block = False
+            if msg[0] == "failed":
+                raise RuntimeError(f"Detector worker {msg[1]} stopped: {msg[2]}")
+            if msg[0] != "done":
+                continue
+
+            _, seq, detections, _, latency = msg
+            entry = self._in_flight.get(seq)
+            if entry is None:
+                continue
+            entry[1] -= 1
+            entry[2].update(detections)
+            entry[3] = max(entry[3], latency)
+            if entry[1] == 0:
+                del self._in_flight[seq]
+                self._free.append(entry[0])
+                self.completed += 1
+                done.append((seq, entry[2], entry[3]))
+        return done
@@ -0,0 +1,41 @@
+# cv/export_model.py
+# One-time conversion of the trained model for the faster CPU backends.
+# Run from the repo root:  python -m cv.export_model [--model model/best.pt] [--format onnx]
+# then start the game with:  python main.py --model model/best.onnx
+import argparse
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def export(model_path, fmt="onnx", imgsz=640, dynamic=True):
+    from ultralytics import YOLO
+
+    # dynamic axes let YOLODetector batch both ROIs and pick imgsz per call
+    kwargs = dict(format=fmt, imgsz=imgsz, half=False)
+    if fmt == "onnx":
+        kwargs.update(dynamic=dynamic, simplify=True)
+    return YOLO(model_path).export(**kwargs)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export the YOLO model for a CPU inference backend")
+    parser.add_argument("--model", default=os.path.join(BASE_DIR, "model", "best.pt"))
+    parser.add_argument("--format", default="onnx", choices=["onnx", "openvino"])
+    parser.add_argument("--imgsz", type=int, default=640)
+    parser.add_argument("--static", action="store_true",
+                        help="fixed batch 1 and input size (some runtimes are faster with static shapes)")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.model):
+        print(f"[ERROR] Model not found: {args.model}")
+        return 1
+
+    out = export(args.model, args.format, args.imgsz, dynamic=not args.static)
+    print(f"[INFO] Exported {args.model} -> {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,274 @@
+import json
+import os
+import threading
+import time
+
+import cv2
+import numpy as np
+
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".bmp", ".webp")
+SESSION_META = "meta.json"
+SESSION_FRAMES = "frames.raw"
+SESSION_TIMESTAMPS = "timestamps.f64"
+
+
+class FrameSource:
+    """
+    What the game loop and the detection pipeline need from a frame producer.
+
+    get_frame(): next frame for the render loop (an owned, writable copy) or None when done.
+    get_latest(): non-blocking (frame, timestamp, seq) of the newest frame; frame is read-only.
+    set_capture_listener(fn): sources capturing on their own thread call
+    fn(frame, timestamp) for every captured frame and return True; others return False.
+    """
+    width = 0
+    height = 0
+    dropped_frames = 0
+
+    def get_frame(self):
+        raise NotImplementedError
+
+    def get_latest(self):
+        raise NotImplementedError
+
+    def set_capture_listener(self, listener):
+        return False
+
+    def release(self):
+        pass
+
+
+class PlaybackSource(FrameSource):
+    """
+    Replays a recorded session directory (see RecordingSource), a video file
+    or a directory of images.
+
+    realtime=True: paced by the recorded timestamps (video/images: by fps),
+    frames that are already late are skipped like a live camera would.
+    realtime=False: every get_frame() returns the next frame, as fast as possible.
+    """
+    def __init__(self, path, realtime=True, loop=False, fps=30.0, width=None, height=None):
+        self.path = path
+        self.realtime = realtime
+        self.loop = loop
+        self.fps = float(fps)
+
+        self._cap = None
+        self._images = None
+        self._raw = None
+        self._timestamps = None
+
+        if os.path.isdir(path) and os.path.exists(os.path.join(path, SESSION_META)):
+            self._open_session(path)
+        elif os.path.isdir(path):
+            self._images = sorted(
+                os.path.join(path, f) for f in os.listdir(path) if f.lower().endswith(IMAGE_EXTS)
+            )
+            if not self._images:
+                raise RuntimeError(f"No images found in: {path}")
+            self.frame_count = len(self._images)
+        else:
+            self._cap = cv2.VideoCapture(path)
+            if not self._cap.isOpened():
+                raise RuntimeError(f"Cannot open video: {path}")
+            video_fps = self._cap.get(cv2.CAP_PROP_FPS)
+            if video_fps and video_fps > 1:
+                self.fps = video_fps
+            self.frame_count = int(self._cap.get(cv2.CAP_PROP_FRAME_COUNT)) or None
+
+        self.width = width
+        self.height = height
+
+        self._index = -1         # index of the frame last handed out
+        self._decoded_index = -1  # video: index of the last decoded frame
+        self._current = None
+        self._current_ts = None
+        self._seq = 0
+        self._lock = threading.Lock()  # _current/_current_ts/_seq are read by the detection worker
+        self._start = None
+        self.dropped_frames = 0
+
+    def _open_session(self, path):
+        with open(os.path.join(path, SESSION_META)) as f:
+            meta = json.load(f)
+        h, w, c = int(meta["height"]), int(meta["width"]), int(meta.get("channels", 3))
+        frame_bytes = h * w * c
+
+        n = os.path.getsize(os.path.join(path, SESSION_FRAMES)) // frame_bytes
+        self._raw = np.memmap(os.path.join(path, SESSION_FRAMES), dtype=np.uint8, mode="r",
+                              shape=(n, h, w, c))
+        ts = np.fromfile(os.path.join(path, SESSION_TIMESTAMPS), dtype=np.float64)[:n]
+        self._timestamps = ts - ts[0] if len(ts) else ts
+        self.frame_count = n
+
+    def _frame_time(self, i):
+        if self._timestamps is not None:
+            return float(self._timestamps[i])
+        return i / self.fps
+
+    def _read(self, i):
+        if self._raw is not None:
+            return np.array(self._raw[i])
+        if self._images is not None:
+            return cv2.imread(self._images[i], cv2.IMREAD_COLOR)
+
+        # video decodes sequentially; skipped frames are still decoded (grab only)
+        while self._decoded_index < i - 1:
+            if not self._cap.grab():
+                return None
+            self._decoded_index += 1
+        ok, frame = self._cap.read()
+        if not ok:
+            return None
+        self._decoded_index += 1
+        return frame
+
+    def _rewind(self):
+        self._index = -1
+        self._decoded_index = -1
+        self._start = time.time()
+        if self._cap is not None:
+            self._cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+
+    def _target_index(self):
+        if not self.realtime:
+            return self._index + 1
+
+        now = time.time()
+        if self._start is None:
+            self._start = now
+        elapsed = now - self._start
+
+        i = max(self._index, 0)
+        n = self.frame_count
+        while (n is None or i + 1 < n) and self._frame_time(i + 1) <= elapsed:
+            i += 1
+        if n is not None and i == n - 1 and elapsed >= self._frame_time(i) + 1.0 / self.fps:
+            return n  # the last frame has had its turn
+        return i
+
+    def get_frame(self):
+        i = self._target_index()
+        if self.frame_count is not None and i >= self.frame_count:
+            if not self.loop:
+                return None
+            self._rewind()
+            i = self._target_index()
+
+        if i == self._index and self._current is not None:
+            # realtime: the next frame isn't due yet, repeat the current one
+            return self._current.copy()
+
+        if i > self._index + 1:
+            self.dropped_frames += i - self._index - 1
+
+        frame = self._read(i)
+        if frame is None:
+            if self.loop and i > 0:
+                self._rewind()
+                return self.get_frame()
+            return None
+
+        if self.width and self.height and frame.shape[:2] != (self.height, self.width):
+            frame = cv2.resize(frame, (self.width, self.height), interpolation=cv2.INTER_LINEAR)
+
+        self._index = i
+        frame.flags.writeable = False
+        with self._lock:
+            self._seq += 1
+            self._current = frame
+            self._current_ts = time.time()
+        return frame.copy()
+
+    def get_latest(self):
+        with self._lock:
+            if self._current is None:
+                return None, None, 0
+            return self._current, self._current_ts, self._seq
+
+    def release(self):
+        if self._cap is not None:
+            self._cap.release()
+        self._raw = None
+
+
+class RecordingSource(FrameSource):
+    """
+    Wraps another source and records its frames into out_dir: frames.raw (raw
+    HxWx3 uint8 frames back to back, memory-mappable), timestamps.f64 (capture
+    time per frame) and meta.json. Play it back with PlaybackSource(out_dir).
+
+    Sources with a capture thread (threaded Camera) hand every captured frame
+    to the recorder from that thread, including frames the game loop never
+    rendered. Other sources are recorded as frames are pulled by get_frame(),
+    each new frame once.
+    """
+    def __init__(self, source, out_dir):
+        self.source = source
+        self.out_dir = out_dir
+        os.makedirs(out_dir, exist_ok=True)
+
+        self._frames_f = open(os.path.join(out_dir, SESSION_FRAMES), "wb")
+        self._ts_f = open(os.path.join(out_dir, SESSION_TIMESTAMPS), "wb")
+        self._shape = None
+        self._last_seq = None
+        self._write_lock = threading.Lock()
+        self.frames_recorded = 0
+        self._on_capture_thread = source.set_capture_listener(self._write)
+
+    @property
+    def width(self):
+        return self.source.width
+
+    @property
+    def height(self):
+        return self.source.height
+
+    @property
+    def dropped_frames(self):
+        return self.source.dropped_frames
+
+    def get_frame(self):
+        frame = self.source.get_frame()
+        if frame is None or self._on_capture_thread:
+            return frame
+
+        latest, ts, seq = self.source.get_latest()
+        if latest is None:
+            # synchronous source: the returned frame is the captured one
+            self._write(frame, time.time())
+        elif seq != self._last_seq:
+            # playback repeats frames at render rate; record each new frame once
+            self._last_seq = seq
+            self._write(latest, ts)
+        return frame
+
+    def _write(self, frame, ts):
+        with self._write_lock:
+            if self._frames_f.closed:
+                return
+            if self._shape is None:
+                self._shape = frame.shape
+                self._write_meta()
+            elif frame.shape != self._shape:
+                raise RuntimeError(f"Frame size changed while recording: {self._shape} -> {frame.shape}")
+            np.ascontiguousarray(frame).tofile(self._frames_f)
+            np.array([ts], dtype=np.float64).tofile(self._ts_f)
+            self.frames_recorded += 1
+
+    def get_latest(self):
+        return self.source.get_latest()
+
+    def _write_meta(self):
+        h, w = self._shape[:2]
+        c = self._shape[2] if len(self._shape) > 2 else 1
+        meta = {"width": w, "height": h, "channels": c, "dtype": "uint8"}
+        with open(os.path.join(self.out_dir, SESSION_META), "w") as f:
+            json.dump(meta, f, indent=2)
+
+    def release(self):
+        self.source.set_capture_listener(None)
+        with self._write_lock:
+            self._frames_f.close()
+            self._ts_f.close()
+        self.source.release()
@@ -0,0 +1,160 @@
+import cv2
+import numpy as np
+
+
+class HandTracker:
+    """
+    Follows one player's hand box between detector runs with sparse
+    Lucas-Kanade optical flow inside the player's ROI. Only a window around
+    the box (margin px, clipped to the ROI) is converted and tracked.
+
+    reset(frame, bbox) seeds corner features inside a detected box (frame
+    coords); update(frame) moves the box by the median flow of the features
+    that survive a forward-backward check. confidence is the fraction of
+    seeded features still tracked. needs_redetect() asks (once) for a fresh
+    detection every redetect_every tracked frames or when an active track
+    drops below min_confidence; an idle tracker (nothing seeded, or the
+    detector saw no hand) never asks, so the motion gate keeps skipping that
+    ROI. center is smoothed (EMA) for spawn positions, from the latest
+    detection on.
+
+    Seed with the frame the detection was made on (DetectionResult.frame),
+    not the frame being rendered, then update() catches up to the current one.
+    """
+    def __init__(self, roi_box, redetect_every=15, min_confidence=0.5, smoothing=0.5,
+                 max_features=40, fb_max_error=1.0, margin=48):
+        self.roi_box = roi_box  # (x1, y1, x2, y2) clipped ROI in frame coords
+        self.redetect_every = redetect_every
+        self.min_confidence = min_confidence
+        self.smoothing = smoothing
+        self.max_features = max_features
+        self.fb_max_error = fb_max_error
+        self.margin = margin
+
+        self._prev_gray = None
+        self._window = None  # (x1, y1, x2, y2) frame coords of _prev_gray
+        self._points = None  # Nx1x2 float32, frame coords
+        self._seeded = 0
+        self.bbox = None     # frame coords
+        self.center = None   # smoothed, frame coords (ints)
+        self._smoothed = None
+        self.confidence = 0.0
+        self.frames_since_detection = 0
+        self._track_lost = False         # an active track was lost (not a detector miss)
+        self._redetect_requested = False
+
+        self._lk_params = dict(winSize=(21, 21), maxLevel=2,
+                               criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 20, 0.03))
+
+    def _window_around(self, bbox):
+        rx1, ry1, rx2, ry2 = self.roi_box
+        m = self.margin
+        return (max(rx1, int(bbox[0]) - m), max(ry1, int(bbox[1]) - m),
+                min(rx2, int(bbox[2]) + m), min(ry2, int(bbox[3]) + m))
+
+    @staticmethod
+    def _gray(frame, window):
+        x1, y1, x2, y2 = window
+        return cv2.cvtColor(frame[y1:y2, x1:x2], cv2.COLOR_BGR2GRAY)
+
+    def reset(self, frame, bbox):
+        """Seed from a detected box (frame coords)."""
+        rx1, ry1, rx2, ry2 = self.roi_box
+        bx1, by1, bx2, by2 = (int(v) for v in bbox)
+        bx1, by1 = max(bx1, rx1), max(by1, ry1)
+        bx2, by2 = min(bx2, rx2), min(by2, ry2)
+
+        self.bbox = (bx1, by1, bx2, by2)
+        self._smoothed = None  # a new detection isn't pulled toward the old position
+        self._set_center(((bx1 + bx2) / 2, (by1 + by2) / 2))
+        self.frames_since_detection = 0
+        self._track_lost = False
+        self._redetect_requested = False
+
+        self._points = None
+        self._seeded = 0
+        self.confidence = 0.0
+        if bx2 - bx1 < 4 or by2 - by1 < 4:
+            self._prev_gray = None
+            return
+
+        self._window = wx1, wy1, _, _ = self._window_around(self.bbox)
+        gray = self._gray(frame, self._window)
+        self._prev_gray = gray
+
+        mask = np.zeros_like(gray)
+        mask[by1 - wy1:by2 - wy1, bx1 - wx1:bx2 - wx1] = 255
+        points = cv2.goodFeaturesToTrack(gray, maxCorners=self.max_features, qualityLevel=0.01,
+                                         minDistance=5, mask=mask)
+        if points is not None:
+            self._points = points.astype(np.float32) + np.float32((wx1, wy1))
+            self._seeded = len(points)
+            self.confidence = 1.0
+
+    def update(self, frame):
+        """Track into a new frame. Returns the smoothed center or None if not tracking."""
+        self.frames_since_detection += 1
+        if self._points is None or self._prev_gray is None:
+            return self.center
+
+        # same window as the previous frame, so both images share coordinates
+        origin = np.float32(self._window[:2])
+        gray = self._gray(frame, self._window)
+        points = self._points - origin
+        nxt, status, _ = cv2.calcOpticalFlowPyrLK(self._prev_gray, gray, points, None, **self._lk_params)
+        back, status_b, _ = cv2.calcOpticalFlowPyrLK(gray, self._prev_gray, nxt, None, **self._lk_params)
+        fb_error = np.linalg.norm((back - points).reshape(-1, 2), axis=1)
+        good = (status.ravel() == 1) & (status_b.ravel() == 1) & (fb_error < self.fb_max_error)
+        nxt += origin
+
+        self._prev_gray = gray
+        self.confidence = good.sum() / self._seeded if self._seeded else 0.0
+        if good.sum() < 3:
+            self._points = None
+            self.confidence = 0.0
+            self._track_lost = True
+            return self.center
+
+        shift = np.median((nxt - self._points).reshape(-1, 2)[good], axis=0)
+        self._points = nxt[good].reshape(-1, 1, 2)
+
+        bx1, by1, bx2, by2 = self.bbox
+        dx, dy = float(shift[0]), float(shift[1])
+        self.bbox = (bx1 + dx, by1 + dy, bx2 + dx, by2 + dy)
+        self._set_center(((self.bbox[0] + self.bbox[2]) / 2, (self.bbox[1] + self.bbox[3]) / 2))
+
+        # follow the box with the window
+        window = self._window_around(self.bbox)
+        if window != self._window:
+            self._window = window
+            self._prev_gray = self._gray(frame, window)
+        return self.center
+
+    def _set_center(self, xy):
+        if self._smoothed is not None:
+            a = self.smoothing
+            xy = (self._smoothed[0] * a + xy[0] * (1 - a), self._smoothed[1] * a + xy[1] * (1 - a))
+        self._smoothed = xy
+        self.center = (int(xy[0]), int(xy[1]))
+
+    def stop(self):
+        # detector saw no hand: hold the last center until the next detection
+        self._points = None
+        self.confidence = 0.0
+        self._track_lost = False
+        self._redetect_requested = False
+
+    def needs_redetect(self):
+        """True once per lost/weak track or per redetect_every tracked frames; False while idle."""
+        if self._redetect_requested:
+            return False
+        tracking = self._points is not None
+        due = tracking and (self.frames_since_detection >= self.redetect_every
+                            or self.confidence < self.min_confidence)
+        if due or self._track_lost:
+            self._redetect_requested = True
+            return True
+        return False
+
+    def lost(self):
+        return self._points is None
@@ -0,0 +1,90 @@
+import ast
+
+import numpy as np
+import torch
+
+BACKENDS = ("auto", "torch", "onnxruntime")
+
+
+class InferenceBackend:
+    """
+    Runs the raw network: forward(x) takes a float32 NCHW tensor in [0, 1]
+    (RGB, letterboxed by YOLODetector) and returns the raw predictions that
+    ultralytics' non_max_suppression expects.
+
+    names: {class index: label}; stride: max model stride; end2end: outputs
+    are already NMS-free detections; channels_last: the backend prefers a
+    channels-last input tensor; fixed_hw: (h, w) the model was exported with
+    when its input shape is static, else None.
+    """
+    names = {}
+    stride = 32
+    end2end = False
+    channels_last = False
+    fixed_hw = None
+
+    def forward(self, x):
+        raise NotImplementedError
+
+
+class TorchBackend(InferenceBackend):
+    """PyTorch eager (or any other format ultralytics' AutoBackend can load, e.g. OpenVINO)."""
+    def __init__(self, model_path):
+        from ultralytics.nn.autobackend import AutoBackend
+
+        self.net = AutoBackend(model_path, device=torch.device("cpu"), fuse=True, verbose=False)
+        self.net.eval()
+        self.names = self.net.names
+        self.stride = int(self.net.stride)
+        self.end2end = getattr(self.net, "end2end", False)
+        # AutoBackend converts .pt models to channels-last on CPU
+        self.channels_last = self.net.format == "pt"
+
+    def forward(self, x):
+        with torch.inference_mode():
+            return self.net(x)
+
+
+class OnnxRuntimeBackend(InferenceBackend):
+    """An exported .onnx model (python -m cv.export_model) on ONNX Runtime's CPU provider."""
+    def __init__(self, model_path, threads=None):
+        try:
+            import onnxruntime as ort
+        except ImportError:
+            raise RuntimeError("onnxruntime is not installed (pip install onnxruntime)")
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+
+        meta = self.session.get_modelmeta().custom_metadata_map  # written by the ultralytics exporter
+        self.names = {int(k): v for k, v in ast.literal_eval(meta["names"]).items()} if "names" in meta else {}
+        self.stride = int(meta.get("stride", 32))
+        self.end2end = meta.get("end2end", "False") == "True"
+
+        inp = self.session.get_inputs()[0]
+        self.input_name = inp.name
+        self.output_names = [o.name for o in self.session.get_outputs()]
+        batch, _, h, w = inp.shape
+        self.fixed_batch = batch if isinstance(batch, int) else None
+        self.fixed_hw = (h, w) if isinstance(h, int) and isinstance(w, int) else None
+
+    def forward(self, x):
+        im = np.ascontiguousarray(x.numpy())
+        if self.fixed_batch and len(im) != self.fixed_batch:
+            # static batch (exported without dynamic=True): one sample at a time
+            outs = [self.session.run(self.output_names, {self.input_name: im[i:i + 1]})[0] for i in range(len(im))]
+            return torch.from_numpy(np.concatenate(outs))
+        return torch.from_numpy(self.session.run(self.output_names, {self.input_name: im})[0])
+
+
+def load_backend(model_path, backend="auto", threads=None):
+    if backend == "auto":
+        backend = "onnxruntime" if model_path.lower().endswith(".onnx") else "torch"
+    if backend == "onnxruntime":
+        return OnnxRuntimeBackend(model_path, threads=threads)
+    if backend == "torch":
+        return TorchBackend(model_path)
+    raise ValueError(f"Unknown inference backend: {backend} (expected one of {BACKENDS})")
@@ -0,0 +1,60 @@
+import time
+
+import cv2
+
+
+class MotionGate:
+    """
+    Cheap per-ROI change detector deciding whether a crop needs a new
+    inference. Each ROI keeps a small grayscale thumbnail of the crop it was
+    last inferred on; if the current crop's thumbnail differs from it by less
+    than threshold (mean absolute difference, 0-255) the previous detection is
+    reused. Comparing against the last *inferred* crop (not the previous frame)
+    means slow drift still adds up to a refresh. Every ROI is re-run at least
+    every refresh_interval seconds regardless.
+    """
+    def __init__(self, thumb_size=32, threshold=5.0, refresh_interval=1.0):
+        self.thumb_size = thumb_size
+        self.threshold = float(threshold)
+        self.refresh_interval = float(refresh_interval)
+        self._last = {}  # key -> (thumbnail, time of inference)
+
+        # stats
+        self.checks = 0
+        self.skipped = 0
+        self.last_diff = {}
+
+    def thumbnail(self, crop):
+        small = cv2.resize(crop, (self.thumb_size, self.thumb_size), interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return small
+
+    def check(self, key, crop, now=None):
+        """Returns (changed, thumbnail). Call mark(key, thumbnail) after running inference on it."""
+        now = time.time() if now is None else now
+        self.checks += 1
+        thumb = self.thumbnail(crop)
+
+        last = self._last.get(key)
+        if last is None or now - last[1] >= self.refresh_interval:
+            return True, thumb
+
+        diff = float(cv2.absdiff(thumb, last[0]).mean())
+        self.last_diff[key] = diff
+        if diff >= self.threshold:
+            return True, thumb
+
+        self.skipped += 1
+        return False, thumb
+
+    def mark(self, key, thumb, now=None):
+        self._last[key] = (thumb, time.time() if now is None else now)
+
+    def invalidate(self, key):
+        # next check() for this key runs inference
+        self._last.pop(key, None)
+
+    def reset(self):
+        self._last.clear()
+        self.last_diff.clear()
@@ -0,0 +1,156 @@
+# cv/quantize_model.py
+# Post-training INT8 quantization of the ONNX detector, calibrated on ROI crops.
+# Run from the repo root:
+#   python -m cv.quantize_model --calib recordings/session1 [--model model/best.onnx]
+# --calib: a recorded session / video (ROI crops are cut from its frames like in the game)
+#          or a folder of images that already are crops.
+# Writes model/best_int8.onnx; play with:  python main.py --model model/best_int8.onnx
+import argparse
+import os
+import re
+import sys
+
+from cv.detection_pipeline import clip_roi
+from cv.frame_source import IMAGE_EXTS, PlaybackSource
+from cv.roi import get_default_rois
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FRAME_WIDTH, FRAME_HEIGHT = 1280, 720  # main.py's capture size (ROI layout)
+
+
+def iter_calibration_crops(path, max_crops=200):
+    """ROI crops from a session/video (every few frames) or the images of a crop folder."""
+    import cv2
+
+    if os.path.isdir(path) and not os.path.exists(os.path.join(path, "meta.json")):
+        names = sorted(f for f in os.listdir(path) if f.lower().endswith(IMAGE_EXTS))
+        for name in names[:max_crops]:
+            img = cv2.imread(os.path.join(path, name), cv2.IMREAD_COLOR)
+            if img is not None:
+                yield img
+        return
+
+    source = PlaybackSource(path, realtime=False, width=FRAME_WIDTH, height=FRAME_HEIGHT)
+    boxes = [clip_roi(roi, FRAME_WIDTH, FRAME_HEIGHT) for roi in get_default_rois(FRAME_WIDTH, FRAME_HEIGHT)]
+    n_frames = source.frame_count or max_crops
+    every = max(1, n_frames * len(boxes) // max_crops)
+    count = 0
+    i = 0
+    try:
+        while count < max_crops:
+            frame = source.get_frame()
+            if frame is None:
+                break
+            i += 1
+            if i % every:
+                continue
+            for x1, y1, x2, y2 in boxes:
+                yield frame[y1:y2, x1:x2]
+                count += 1
+    finally:
+        source.release()
+
+
+class RoiCalibrationReader:
+    """onnxruntime CalibrationDataReader feeding crops preprocessed exactly like YOLODetector does."""
+    def __init__(self, detector, crops, imgsz):
+        self.input_name = detector.backend.input_name
+        self._inputs = []
+        for crop in crops:
+            x, _ = detector.preprocess([crop], imgsz)
+            self._inputs.append(x.numpy().copy())  # the detector reuses its input buffer
+        self._it = iter(self._inputs)
+
+    def __len__(self):
+        return len(self._inputs)
+
+    def get_next(self):
+        x = next(self._it, None)
+        return None if x is None else {self.input_name: x}
+
+    def rewind(self):
+        self._it = iter(self._inputs)
+
+
+def head_nodes(model):
+    # the Detect head (last "/model.N/" block) decodes boxes; it stays float for accuracy
+    index = [int(m.group(1)) for n in model.graph.node if (m := re.match(r"/model\.(\d+)/", n.name))]
+    if not index:
+        return []
+    prefix = f"/model.{max(index)}/"
+    return [n.name for n in model.graph.node if n.name.startswith(prefix)]
+
+
+def quantize(model_path, calib_path, out_path, imgsz=640, max_crops=200, quantize_head=False):
+    import onnx
+    from onnxruntime.quantization import CalibrationMethod, QuantFormat, QuantType, quantize_static
+
+    from cv.yolo_detector import YOLODetector
+
+    detector = YOLODetector(model_path, backend="onnxruntime", imgsz=imgsz)
+    crops = list(iter_calibration_crops(calib_path, max_crops))
+    if not crops:
+        raise RuntimeError(f"No calibration crops found in: {calib_path}")
+    print(f"[INFO] Calibrating on {len(crops)} crops at imgsz {detector.imgsz}")
+    reader = RoiCalibrationReader(detector, crops, detector.imgsz)
+
+    # fold/fuse and annotate shapes first; without it the QDQ graph runs no faster than fp32
+    from onnxruntime.quantization.shape_inference import quant_pre_process
+
+    prepared = os.path.splitext(out_path)[0] + "_prep.onnx"
+    try:
+        quant_pre_process(model_path, prepared, skip_symbolic_shape=True)
+    except Exception as e:
+        print(f"[WARN] Pre-processing failed ({e}), quantizing the model as is")
+        prepared = model_path
+
+    fp32 = onnx.load(model_path)
+    quantize_static(
+        prepared, out_path, reader,
+        quant_format=QuantFormat.QDQ,
+        per_channel=True,
+        weight_type=QuantType.QInt8,
+        activation_type=QuantType.QUInt8,
+        calibrate_method=CalibrationMethod.MinMax,
+        nodes_to_exclude=[] if quantize_head else head_nodes(fp32),
+    )
+
+    # keep the exporter metadata (class names, stride) so YOLODetector can load it
+    int8 = onnx.load(out_path)
+    del int8.metadata_props[:]
+    int8.metadata_props.extend(fp32.metadata_props)
+    onnx.save(int8, out_path)
+    if prepared != model_path:
+        os.remove(prepared)
+    return out_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="INT8-quantize the ONNX detector on ROI crops")
+    parser.add_argument("--model", default=os.path.join(BASE_DIR, "model", "best.onnx"),
+                        help="fp32 .onnx (a .pt is exported first, see cv.export_model)")
+    parser.add_argument("--calib", required=True,
+                        help="recorded session dir / video, or a folder of crop images")
+    parser.add_argument("--out", default=None, help="default: <model>_int8.onnx")
+    parser.add_argument("--imgsz", type=int, default=640)
+    parser.add_argument("--max-crops", type=int, default=200)
+    parser.add_argument("--quantize-head", action="store_true",
+                        help="also quantize the Detect head (faster, usually less accurate)")
+    args = parser.parse_args(argv)
+
+    model_path = args.model
+    if model_path.endswith(".pt"):
+        from cv.export_model import export
+        model_path = export(model_path, "onnx", args.imgsz)
+    if not os.path.exists(model_path):
+        print(f"[ERROR] Model not found: {model_path} (export it with python -m cv.export_model)")
+        return 1
+
+    out = args.out or os.path.splitext(model_path)[0] + "_int8.onnx"
+    quantize(model_path, args.calib, out, args.imgsz, args.max_crops, args.quantize_head)
+    print(f"[INFO] Wrote {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,8 +10,9 @@ class ROI:
         # Check if the center of the bounding box is within the ROI
         center_x = bx + bw / 2
         center_y = by + bh / 2
-        return (self.x <= center_x <= self.x + self.w and
-                self.y <= center_y <= self.y + self.h)
+        # & instead of chained comparisons, so arrays of boxes give a boolean mask
+        return ((self.x <= center_x) & (center_x <= self.x + self.w) &
+                (self.y <= center_y) & (center_y <= self.y + self.h))
 
 def get_default_rois(frame_width, frame_height):
     # Two boxes, one on left, one on right
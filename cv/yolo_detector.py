@@ -1,28 +1,174 @@
-from ultralytics import YOLO
+import cv2
+import numpy as np
+import torch
+from ultralytics.utils import ops
+from ultralytics.utils.nms import non_max_suppression
+
+from cv.inference_backends import load_backend
+
+LETTERBOX_PAD = 114   # ultralytics' letterbox fill value
+PREDICT_IOU = 0.7     # ultralytics' predict() defaults, kept so results match model(...)
+PREDICT_MAX_DET = 300
+
+# one row per detection, boxes xyxy in crop coords
+DETECTION_DTYPE = np.dtype([
+    ("x1", np.float32), ("y1", np.float32), ("x2", np.float32), ("y2", np.float32),
+    ("conf", np.float32), ("cls", np.int32),
+])
+
+
+class _InputBuffers:
+    """
+    Preallocated letterbox canvas (uint8, NHWC) and model input (float32,
+    NCHW) for one (batch size, input shape). A slot is only re-padded when
+    the placement of its image changes.
+    """
+    def __init__(self, n, height, width, channels_last):
+        self.canvas = np.full((n, height, width, 3), LETTERBOX_PAD, dtype=np.uint8)
+        self.canvas_t = torch.from_numpy(self.canvas)
+        memory_format = torch.channels_last if channels_last else torch.contiguous_format
+        self.input = torch.empty((n, 3, height, width), dtype=torch.float32, memory_format=memory_format)
+        self.layout = [None] * n  # (top, left, h, w) of the image in each slot
+        self.resized = {}         # (h, w) -> resize scratch
+
 
 class YOLODetector:
-    def __init__(self, model_path='yolov8n.pt', confidence=0.5):
-        self.model = YOLO(model_path)
+    """
+    YOLO on crops without the ultralytics predictor: letterboxing into reused
+    buffers is done here, inference runs on a backend from
+    cv/inference_backends.py, and NMS and box rescaling use ultralytics' own
+    functions, so detections match model(crop).
+    """
+    def __init__(self, model_path='yolov8n.pt', confidence=0.5, imgsz=640, backend="auto", threads=None,
+                 classes=None):
+        self.backend = load_backend(model_path, backend, threads=threads)  # "auto": ONNX Runtime for .onnx
         self.confidence = confidence
+        self.names = self.backend.names
+        self.classes = self._class_indices(classes)  # labels or class indices to keep, None for all
+        self.stride = self.backend.stride
+        # the letterbox canvas is NHWC, so a channels-last input tensor is a straight copy
+        self.channels_last = self.backend.channels_last
+        self.end2end = self.backend.end2end
+        self.fixed_hw = self.backend.fixed_hw
+        self.imgsz = self.check_imgsz(imgsz if self.fixed_hw is None else max(self.fixed_hw))
+        self._buffers = {}  # (n, height, width) -> _InputBuffers
+
+    def _class_indices(self, classes):
+        if classes is None:
+            return None
+        by_label = {label.lower(): i for i, label in self.names.items()}
+        indices = []
+        for c in classes:
+            if isinstance(c, str):
+                if c.lower() not in by_label:
+                    raise ValueError(f"Unknown class: {c}")
+                c = by_label[c.lower()]
+            indices.append(int(c))
+        return indices
+
+    def check_imgsz(self, imgsz):
+        return max(self.stride, -(-int(imgsz) // self.stride) * self.stride)
+
+    def detect(self, frame, imgsz=None):
+        return self.detect_batch([frame], imgsz=imgsz)[0]
+
+    def detect_batch(self, crops, imgsz=None):
+        """
+        Run several crops (e.g. one per player ROI) through a single forward pass
+        at imgsz (default self.imgsz). Returns one detection list per crop, in order.
+        """
+        return [self.to_dicts(arr) for arr in self.detect_arrays(crops, imgsz)]
+
+    def detect_top1(self, crops, imgsz=None):
+        """Like detect_batch, but only each crop's best detection (or None)."""
+        return [self.to_dicts(arr)[0] if len(arr) else None for arr in self.detect_arrays(crops, imgsz, max_det=1)]
+
+    def detect_arrays(self, crops, imgsz=None, max_det=PREDICT_MAX_DET):
+        """One DETECTION_DTYPE array per crop, sorted by decreasing confidence."""
+        if not crops:
+            return []
+
+        if imgsz is None or self.fixed_hw is not None:
+            imgsz = self.imgsz
+        else:
+            imgsz = self.check_imgsz(imgsz)
+        x, metas = self.preprocess(crops, imgsz)
+        preds = self.backend.forward(x)
+        # confidence and classes are applied inside NMS; a weaker box can't suppress a stronger
+        # one, so this keeps the same boxes as ultralytics' 0.25 followed by a filter
+        dets = non_max_suppression(preds, self.confidence, PREDICT_IOU, classes=self.classes,
+                                   max_det=max_det, end2end=self.end2end)
+
+        rows = torch.cat(dets).numpy()  # (sum n, 6) xyxy, conf, cls: one transfer for the batch
+        arrays = []
+        start = 0
+        for det, meta, crop in zip(dets, metas, crops):
+            d = rows[start:start + len(det)]
+            start += len(det)
+            boxes = ops.scale_boxes(None, d[:, :4], crop.shape[:2], ratio_pad=meta)
+            arr = np.empty(len(d), dtype=DETECTION_DTYPE)
+            arr["x1"], arr["y1"], arr["x2"], arr["y2"] = boxes.T
+            arr["conf"] = d[:, 4]
+            arr["cls"] = d[:, 5]
+            arrays.append(arr)
+        return arrays
+
+    def input_shape(self, crops, imgsz):
+        # (height, width) of the batch tensor; like ultralytics, same-shape crops are padded only to
+        # the nearest stride multiple (e.g. 448x640 for 400x600 ROIs at 640), not to a square
+        if self.fixed_hw is not None:
+            return self.fixed_hw  # static export
+        shapes = {crop.shape[:2] for crop in crops}
+        if len(shapes) > 1:
+            return imgsz, imgsz
+        h, w = shapes.pop()
+        r = min(imgsz / h, imgsz / w)
+        nh, nw = round(h * r), round(w * r)
+        return nh + (imgsz - nh) % self.stride, nw + (imgsz - nw) % self.stride
+
+    def preprocess(self, crops, imgsz):
+        """Letterbox crops (BGR uint8) into the reused input tensor. Returns (tensor, metas)."""
+        in_h, in_w = self.input_shape(crops, imgsz)
+        key = (len(crops), in_h, in_w)
+        buf = self._buffers.get(key)
+        if buf is None:
+            buf = self._buffers[key] = _InputBuffers(*key, channels_last=self.channels_last)
 
-    def detect(self, frame):
-        results = self.model(frame, verbose=False)
-        detections = []
+        metas = []
+        for i, crop in enumerate(crops):
+            h, w = crop.shape[:2]
+            r = min(min(in_h, imgsz) / h, min(in_w, imgsz) / w)
+            nw, nh = round(w * r), round(h * r)
+            top, left = round((in_h - nh) / 2 - 0.1), round((in_w - nw) / 2 - 0.1)
 
-        for r in results:
-            for box in r.boxes:
-                conf = float(box.conf[0])
-                if conf < self.confidence:
-                    continue
+            if (nw, nh) != (w, h):
+                scratch = buf.resized.get((nh, nw))
+                if scratch is None:
+                    scratch = buf.resized[(nh, nw)] = np.empty((nh, nw, 3), dtype=np.uint8)
+                cv2.resize(crop, (nw, nh), dst=scratch, interpolation=cv2.INTER_LINEAR)
+                crop = scratch
 
-                cls = int(box.cls[0])
-                label = self.model.names[cls]
+            slot = buf.canvas[i]
+            layout = (top, left, nh, nw)
+            if buf.layout[i] != layout:
+                slot.fill(LETTERBOX_PAD)
+                buf.layout[i] = layout
+            slot[top:top + nh, left:left + nw] = crop
+            cv2.cvtColor(slot, cv2.COLOR_BGR2RGB, dst=slot)  # the gray padding is unaffected
+            metas.append(((nh / h, nw / w), (left, top)))
 
-                x1, y1, x2, y2 = box.xyxy[0]
-                detections.append({
-                    "label": label,
-                    "conf": conf,
-                    "bbox": (float(x1), float(y1), float(x2), float(y2))  # ✅ xyxy
-                })
+        # uint8 NHWC -> float NCHW in [0, 1], in place (a plain copy for a channels-last input)
+        buf.input.copy_(buf.canvas_t.permute(0, 3, 1, 2))
+        buf.input.div_(255)
+        return buf.input, metas
 
-        return detections
+    def to_dicts(self, arr):
+        """DETECTION_DTYPE rows -> [{"label", "conf", "bbox"}] (what detect_batch returns)."""
+        return [
+            {
+                "label": self.names[cls],
+                "conf": conf,
+                "bbox": (x1, y1, x2, y2)  # ✅ xyxy
+            }
+            for x1, y1, x2, y2, conf, cls in arr.tolist()
+        ]
@@ -21,11 +21,3 @@ COOLDOWNS = {
     AbilityType.HEAVY_ATTACK: 5.0,
     AbilityType.WATER_BALL: 1.0
 }
-
-def check_combo(sequence):
-    # Check for the longest matching combo at the end of the sequence
-    for ability, combo in sorted(COMBOS.items(), key=lambda x: len(x[1]), reverse=True):
-        if len(sequence) >= len(combo):
-            if sequence[-len(combo):] == combo:
-                return ability
-    return None
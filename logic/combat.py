@@ -1,5 +1,3 @@
-import time
-
 class Projectile:
     def __init__(self, x, y, direction, speed, damage, owner_id, ability_type=None):
         self.x = x
@@ -11,32 +9,44 @@ class Projectile:
         self.active = True
         self.radius = 20
         self.ability_type = ability_type
+        self.prev_x = x  # position before the last update (swept collision tests)
 
     def update(self, dt):
+        self.prev_x = self.x
         self.x += self.direction * self.speed * dt
         # Simple boundary check
         if self.x < 0 or self.x > 2000: # Assuming 1280 wide, but some buffer
             self.active = False
 
+    def swept_x(self):
+        # x range covered during the last update
+        return min(self.prev_x, self.x), max(self.prev_x, self.x)
+
 class Wall:
-    def __init__(self, x, y, owner_id, duration=2.0):
+    def __init__(self, x, y, owner_id, duration=2.0, start_time=0.0):
         self.x = x
         self.y = y
         self.owner_id = owner_id
-        self.start_time = time.time()
+        self.start_time = start_time  # simulation time (CombatManager.sim_time)
         self.duration = duration
         self.active = True
         self.width = 40
         self.height = 150
 
-    def update(self):
-        if time.time() - self.start_time >= self.duration:
+    def update(self, now):
+        if now - self.start_time >= self.duration:
             self.active = False
 
 class CombatManager:
+    """
+    Combat runs on simulation time only: projectiles move by the dt passed
+    to update() and walls age by it too (sim_time), so a clamped or stepped
+    frame affects both the same way and no clock has to be kept in sync.
+    """
     def __init__(self):
         self.projectiles = []
         self.walls = []
+        self.sim_time = 0.0  # sum of the dt passed to update()
 
     def spawn_projectile(self, x, y, direction, ability_type, owner_id):
         if ability_type == "fireball":
@@ -47,9 +57,11 @@ class CombatManager:
             self.projectiles.append(Projectile(x, y, direction, speed=600, damage=10, owner_id=owner_id, ability_type=ability_type))
 
     def spawn_wall(self, x, y, owner_id):
-        self.walls.append(Wall(x, y, owner_id))
+        self.walls.append(Wall(x, y, owner_id, start_time=self.sim_time))
 
     def update(self, dt, players):
+        self.sim_time += dt
+
         # Update projectiles
         for p in self.projectiles:
             if not p.active: continue
@@ -70,12 +82,14 @@ class CombatManager:
             
             if not p.active: continue
 
-            # Check collisions with walls
+            # Check collisions with walls (swept: the path this step, so fast
+            # projectiles can't tunnel through the 40 px wall)
+            x_lo, x_hi = p.swept_x()
             for w in self.walls:
                 if not w.active: continue
                 if w.owner_id != p.owner_id:
                     # Simple AABB check for wall and point/circle for projectile
-                    if (w.x - 20 <= p.x <= w.x + w.width + 20 and
+                    if (x_lo <= w.x + w.width + 20 and x_hi >= w.x - 20 and
                         w.y <= p.y <= w.y + w.height):
                         p.active = False
                         w.active = False # Wall blocks one fireball
@@ -88,9 +102,9 @@ class CombatManager:
                 if player_id != p.owner_id:
                     # Player hit box (approximate center of ROI)
                     # We'll use the ROI center from player object later
-                    dist_x = abs(p.x - player.center_x)
+                    # swept along x like the walls
                     dist_y = abs(p.y - player.center_y)
-                    if dist_x < 50 and dist_y < 100:
+                    if x_lo < player.center_x + 50 and x_hi > player.center_x - 50 and dist_y < 100:
                         player.take_damage(p.damage)
                         p.active = False
                         break
@@ -98,7 +112,7 @@ class CombatManager:
         # Update walls
         for w in self.walls:
             if w.active:
-                w.update()
+                w.update(self.sim_time)
 
         # Cleanup
         self.projectiles = [p for p in self.projectiles if p.active]
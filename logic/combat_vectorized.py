@@ -0,0 +1,306 @@
+import numpy as np
+
+from logic.combat import Projectile, Wall
+
+# Same stats as CombatManager.spawn_projectile
+PROJECTILE_TYPES = ["fireball", "heavy_attack", "water_ball"]
+PROJECTILE_STATS = {
+    "fireball": (600, 10),      # speed, damage
+    "heavy_attack": (400, 25),
+    "water_ball": (600, 10),
+}
+_TYPE_CODE = {name: i for i, name in enumerate(PROJECTILE_TYPES)}
+_FIREBALL = _TYPE_CODE["fireball"]
+_WATER_BALL = _TYPE_CODE["water_ball"]
+
+PROJECTILE_RADIUS = 20
+WALL_WIDTH = 40
+WALL_HEIGHT = 150
+WALL_DURATION = 2.0
+WALL_MARGIN = 20                      # projectile counts as inside a wall this far left/right of it
+PLAYER_HIT_HALF_W, PLAYER_HIT_HALF_H = 50, 100
+ARENA_MIN_X, ARENA_MAX_X = 0, 2000
+
+
+class _Columns:
+    """Struct-of-arrays storage with amortized growth."""
+    def __init__(self, fields, capacity=64):
+        self._fields = fields  # name -> dtype
+        self.n = 0
+        self._alloc(capacity)
+
+    def _alloc(self, capacity):
+        for name, dtype in self._fields.items():
+            arr = np.zeros(capacity, dtype=dtype)
+            old = getattr(self, name, None)
+            if old is not None:
+                arr[:self.n] = old[:self.n]
+            setattr(self, name, arr)
+        self.capacity = capacity
+
+    def append(self, **values):
+        if self.n == self.capacity:
+            self._alloc(self.capacity * 2)
+        i = self.n
+        for name, value in values.items():
+            getattr(self, name)[i] = value
+        self.n += 1
+
+    def view(self, name):
+        return getattr(self, name)[:self.n]
+
+    def compact(self, keep):
+        """Keep rows where keep (bool, length n) is True, preserving order."""
+        k = int(keep.sum())
+        if k == self.n:
+            return
+        for name in self._fields:
+            arr = getattr(self, name)
+            arr[:k] = arr[:self.n][keep]
+        self.n = k
+
+    def clear(self):
+        self.n = 0
+
+
+class VectorizedCombatManager:
+    """
+    Drop-in alternative to CombatManager that keeps projectiles and walls in
+    NumPy column arrays and resolves a tick with batched array operations.
+
+    Every projectile moves in one array op; fireball/water ball pairs and
+    wall overlaps are found with broadcast tests. The few projectiles that
+    interact are then resolved in spawn order exactly like CombatManager's
+    loop, the rest only check player hit boxes (vectorized). Results match
+    CombatManager tick for tick (python -m bench.bench_combat).
+    """
+    def __init__(self):
+        self.sim_time = 0.0  # walls age in simulation time, like CombatManager
+        self._p = _Columns({
+            "x": np.float64, "prev_x": np.float64, "y": np.float64, "vx": np.float64,
+            "owner": np.int32, "kind": np.int8, "radius": np.float64,
+            "damage": np.int32, "active": np.bool_,
+        })
+        self._w = _Columns({
+            "x": np.float64, "y": np.float64, "width": np.float64, "height": np.float64,
+            "owner": np.int32, "start": np.float64, "duration": np.float64, "active": np.bool_,
+        })
+
+    # ---------------------------
+    # CombatManager API
+    # ---------------------------
+    def spawn_projectile(self, x, y, direction, ability_type, owner_id):
+        stats = PROJECTILE_STATS.get(ability_type)
+        if stats is None:
+            return
+        speed, damage = stats
+        self._p.append(x=x, prev_x=x, y=y, vx=direction * speed, owner=owner_id, kind=_TYPE_CODE[ability_type],
+                       radius=PROJECTILE_RADIUS, damage=damage, active=True)
+
+    def spawn_wall(self, x, y, owner_id):
+        self._w.append(x=x, y=y, width=WALL_WIDTH, height=WALL_HEIGHT, owner=owner_id,
+                       start=self.sim_time, duration=WALL_DURATION, active=True)
+
+    def reset(self):
+        self._p.clear()
+        self._w.clear()
+
+    @property
+    def projectiles(self):
+        """Snapshot as Projectile objects (for debugging/rendering; not live)."""
+        p = self._p
+        out = []
+        for i in range(p.n):
+            kind = PROJECTILE_TYPES[p.kind[i]]
+            speed = abs(p.vx[i])
+            proj = Projectile(float(p.x[i]), float(p.y[i]), 1 if p.vx[i] >= 0 else -1, speed,
+                              int(p.damage[i]), int(p.owner[i]), ability_type=kind)
+            proj.radius = float(p.radius[i])
+            proj.prev_x = float(p.prev_x[i])
+            out.append(proj)
+        return out
+
+    @projectiles.setter
+    def projectiles(self, value):
+        # GameManager.start_game clears with "= []"
+        if value:
+            raise ValueError("VectorizedCombatManager only supports clearing projectiles")
+        self._p.clear()
+
+    @property
+    def walls(self):
+        w = self._w
+        out = []
+        for i in range(w.n):
+            wall = Wall(float(w.x[i]), float(w.y[i]), int(w.owner[i]), duration=float(w.duration[i]),
+                        start_time=float(w.start[i]))
+            out.append(wall)
+        return out
+
+    @walls.setter
+    def walls(self, value):
+        if value:
+            raise ValueError("VectorizedCombatManager only supports clearing walls")
+        self._w.clear()
+
+    def update(self, dt, players):
+        p, w = self._p, self._w
+        self.sim_time += dt
+
+        if p.n:
+            x, old_x = p.view("x"), p.view("prev_x")
+            old_x[:] = x
+            x += p.view("vx") * dt
+
+            # Projectiles that can touch another projectile or a wall this tick must be
+            # resolved in spawn order (first match wins, a wall blocks one projectile).
+            # Everything else only moves and maybe hits a player, which is order-free.
+            partners = self._cancel_candidates(old_x)
+            in_wall = self._wall_candidates(old_x)
+            entangled = np.zeros(p.n, dtype=np.bool_)
+            entangled[list(partners)] = True
+            entangled |= in_wall.any(axis=1) if in_wall is not None else False
+
+            free = p.view("active") & ~entangled
+            self._move_and_hit(free, players)
+            if entangled.any():
+                self._resolve_in_order(np.flatnonzero(entangled), old_x, partners, in_wall, players)
+
+        # ---- walls expire ----
+        if w.n:
+            w_active = w.view("active")
+            w_active &= (self.sim_time - w.view("start")) < w.view("duration")
+
+        # ---- cleanup ----
+        if p.n:
+            p.compact(p.view("active").copy())
+        if w.n:
+            w.compact(w.view("active").copy())
+
+    # ---------------------------
+    # Phases
+    # ---------------------------
+    def _cancel_candidates(self, old_x):
+        """
+        Fireball/water ball pairs of different owners that may collide this tick.
+        In spawn order the earlier projectile a checks b before b has moved, and b
+        checks a after both moved, so both placements are tested.
+        Returns {index: sorted partner indices}.
+        """
+        p = self._p
+        active, kind = p.view("active"), p.view("kind")
+        fire = np.flatnonzero(active & (kind == _FIREBALL))
+        water = np.flatnonzero(active & (kind == _WATER_BALL))
+        if not len(fire) or not len(water):
+            return {}
+
+        x, y, r, owner = p.view("x"), p.view("y"), p.view("radius"), p.view("owner")
+        reach = r[fire][:, None] + r[water][None, :]
+        dy = y[fire][:, None] - y[water][None, :]
+        fire_first = fire[:, None] < water[None, :]
+
+        dx_moved = x[fire][:, None] - x[water][None, :]
+        # earlier one moved, later one not yet
+        dx_half = np.where(fire_first,
+                           x[fire][:, None] - old_x[water][None, :],
+                           old_x[fire][:, None] - x[water][None, :])
+        near = ((np.sqrt(dx_moved * dx_moved + dy * dy) < reach) |
+                (np.sqrt(dx_half * dx_half + dy * dy) < reach))
+        near &= owner[fire][:, None] != owner[water][None, :]
+        if not near.any():
+            return {}
+
+        partners = {}
+        for fi, wi in zip(*np.nonzero(near)):
+            a, b = int(fire[fi]), int(water[wi])
+            partners.setdefault(a, []).append(b)
+            partners.setdefault(b, []).append(a)
+        for lst in partners.values():
+            lst.sort()
+        return partners
+
+    def _wall_candidates(self, old_x):
+        """(projectiles x walls) bool: the path of this step crosses an enemy wall box."""
+        p, w = self._p, self._w
+        if not w.n:
+            return None
+
+        x = p.view("x")
+        lo, hi = np.minimum(old_x, x)[:, None], np.maximum(old_x, x)[:, None]
+        py, powner = p.view("y")[:, None], p.view("owner")[:, None]
+        wx, wy = w.view("x")[None, :], w.view("y")[None, :]
+        ww, wh = w.view("width")[None, :], w.view("height")[None, :]
+        inside = ((lo <= wx + ww + WALL_MARGIN) & (hi >= wx - WALL_MARGIN) &
+                  (wy <= py) & (py <= wy + wh) &
+                  (w.view("owner")[None, :] != powner) & w.view("active")[None, :])
+        inside &= p.view("active")[:, None]
+        return inside
+
+    def _move_and_hit(self, mask, players):
+        p = self._p
+        active = p.view("active")
+        x = p.view("x")
+        active[mask & ((x < ARENA_MIN_X) | (x > ARENA_MAX_X))] = False
+
+        idx = np.flatnonzero(mask & active)
+        if not len(idx):
+            return
+        x0, x1 = p.prev_x[idx], x[idx]
+        lo, hi = np.minimum(x0, x1), np.maximum(x0, x1)
+        y, owner, damage = p.y[idx], p.owner[idx], p.damage[idx]
+        hit_any = np.zeros(len(idx), dtype=np.bool_)
+        for player_id, player in players.items():
+            # swept along x: the path of this step overlaps the hit box
+            hit = ((owner != player_id) & ~hit_any &
+                   (lo < player.center_x + PLAYER_HIT_HALF_W) & (hi > player.center_x - PLAYER_HIT_HALF_W) &
+                   (np.abs(y - player.center_y) < PLAYER_HIT_HALF_H))
+            if hit.any():
+                # one call per hit keeps Player.take_damage's clamping identical
+                for amount in damage[hit]:
+                    player.take_damage(int(amount))
+                hit_any |= hit
+        active[idx[hit_any]] = False
+
+    def _resolve_in_order(self, order, old_x, partners, in_wall, players):
+        """The classic per-object loop, run only over the entangled projectiles."""
+        p, w = self._p, self._w
+        active, x, y, r = p.view("active"), p.view("x"), p.view("y"), p.view("radius")
+        w_active = w.view("active") if w.n else None
+        moved = set()
+
+        for i in order:
+            if not active[i]:
+                continue
+            moved.add(i)
+            if x[i] < ARENA_MIN_X or x[i] > ARENA_MAX_X:
+                active[i] = False  # still cancels a partner below, like Projectile.update
+
+            for j in partners.get(i, ()):
+                if not active[j]:
+                    continue
+                xj = x[j] if j in moved else old_x[j]
+                dist = ((x[i] - xj) ** 2 + (y[i] - y[j]) ** 2) ** 0.5
+                if dist < r[i] + r[j]:
+                    active[i] = False
+                    active[j] = False
+                    break
+            if not active[i]:
+                continue
+
+            if in_wall is not None:
+                for wall in np.flatnonzero(in_wall[i]):
+                    if w_active[wall]:
+                        active[i] = False
+                        w_active[wall] = False
+                        break
+            if not active[i]:
+                continue
+
+            lo, hi = min(old_x[i], x[i]), max(old_x[i], x[i])
+            for player_id, player in players.items():
+                if (player_id != p.owner[i] and lo < player.center_x + PLAYER_HIT_HALF_W
+                        and hi > player.center_x - PLAYER_HIT_HALF_W
+                        and abs(y[i] - player.center_y) < PLAYER_HIT_HALF_H):
+                    player.take_damage(int(p.damage[i]))
+                    active[i] = False
+                    break
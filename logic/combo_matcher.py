@@ -0,0 +1,128 @@
+from core.clock import REAL_CLOCK
+from logic.abilities import COMBOS
+
+
+class ComboAutomaton:
+    """
+    Aho-Corasick automaton compiled once from a combo table {ability: [sign, ...]}.
+
+    A state is the longest suffix of the signs seen so far that is a prefix of
+    some combo. goto[state] is a complete transition table over every sign in
+    the table (unknown signs go back to the root), so advancing is one dict
+    lookup. match[state] is the longest combo ending in that state, so the
+    longest combo wins when several end on the same sign.
+    """
+    def __init__(self, combos):
+        self.goto = [{}]
+        self.fail = [0]
+        self.depth = [0]
+        self.match = [None]
+
+        for ability, combo in combos.items():
+            if not combo:
+                continue
+            state = 0
+            for sign in combo:
+                nxt = self.goto[state].get(sign)
+                if nxt is None:
+                    nxt = self._new_state(self.depth[state] + 1)
+                    self.goto[state][sign] = nxt
+                state = nxt
+            if self.match[state] is None:  # first entry wins for duplicate sequences
+                self.match[state] = ability
+
+        self.max_length = max(self.depth)
+        self._compile(sorted({s for combo in combos.values() for s in combo}))
+
+    def _new_state(self, depth):
+        self.goto.append({})
+        self.fail.append(0)
+        self.depth.append(depth)
+        self.match.append(None)
+        return len(self.goto) - 1
+
+    def _compile(self, alphabet):
+        # BFS: fail links, inherited matches and the full transition table
+        queue = []
+        root = self.goto[0]
+        for sign in alphabet:
+            child = root.get(sign)
+            if child is None:
+                root[sign] = 0
+            else:
+                queue.append(child)
+
+        for state in queue:  # grows while iterating
+            trie_children = dict(self.goto[state])
+            if self.match[state] is None:
+                self.match[state] = self.match[self.fail[state]]
+            for sign in alphabet:
+                child = trie_children.get(sign)
+                if child is None:
+                    self.goto[state][sign] = self.goto[self.fail[state]][sign]
+                else:
+                    self.fail[child] = self.goto[self.fail[state]][sign]
+                    queue.append(child)
+
+    def step(self, state, sign):
+        return self.goto[state].get(sign, 0)
+
+
+_default_automaton = None
+
+
+def default_automaton():
+    global _default_automaton
+    if _default_automaton is None:
+        _default_automaton = ComboAutomaton(COMBOS)
+    return _default_automaton
+
+
+class ComboMatcher:
+    """
+    Per-player match state over a shared ComboAutomaton. push() takes one
+    stabilized sign and returns the ability it completes, or None.
+
+    Signs older than time_window (or further back than max_length signs) no
+    longer count towards a combo, like InputBuffer: when the current state
+    reaches back past them it falls back along the failure links.
+    """
+    def __init__(self, automaton=None, time_window=1.5, max_length=5, clock=None):
+        self.automaton = automaton or default_automaton()
+        self.clock = clock or REAL_CLOCK
+        self.time_window = time_window
+        self.max_length = max_length
+
+        # timestamps of the last signs, as many as the longest combo needs
+        self._size = max(1, min(self.automaton.max_length, max_length))
+        self._times = [0.0] * self._size
+        self._head = 0
+        self.state = 0
+
+    def push(self, sign):
+        if sign is None:
+            return None
+
+        now = self.clock.now()
+        self._times[self._head] = now
+        self._head = (self._head + 1) % self._size
+
+        a = self.automaton
+        state = a.step(self.state, sign)
+        # drop signs that fell out of the window / past max_length
+        while a.depth[state] > self._size or (
+                a.depth[state] > 1 and now - self._time_back(a.depth[state]) > self.time_window):
+            state = a.fail[state]
+        self.state = state
+
+        ability = a.match[state]
+        if ability is not None:
+            self.clear()
+        return ability
+
+    def _time_back(self, n):
+        # timestamp of the n-th most recent sign (n = 1 is the newest)
+        return self._times[(self._head - n) % self._size]
+
+    def clear(self):
+        self.state = 0
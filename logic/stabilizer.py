@@ -1,26 +1,68 @@
-import time
+from collections import deque
+
+from core.clock import REAL_CLOCK
 
 class Stabilizer:
-    def __init__(self, window_ms=200):
+    """
+    Confidence-weighted voting over the detections of the last window_ms.
+
+    Every update adds (label, conf, timestamp) to a short ring buffer; a
+    missing detection (None) votes for "no sign" with none_weight. A label is
+    declared when it holds at least enter_share of the weighted votes, has
+    min_votes samples and has been seen for hold_ms. The declared sign then
+    stays until its share drops below exit_share (hysteresis), so a dropped
+    frame or a single wrong label doesn't reset it, and 10-15 Hz detection
+    is enough to recognize a sign.
+
+    update() returns the sign only when it becomes the declared one, else None.
+    """
+    def __init__(self, window_ms=400, hold_ms=80, min_votes=2, enter_share=0.6, exit_share=0.35,
+                 none_weight=0.5, max_samples=32, clock=None):
+        self.clock = clock or REAL_CLOCK
         self.window_s = window_ms / 1000.0
+        self.hold_s = hold_ms / 1000.0
+        self.min_votes = min_votes
+        self.enter_share = enter_share
+        self.exit_share = exit_share
+        self.none_weight = none_weight
+        self.samples = deque(maxlen=max_samples)  # (label, conf, timestamp)
         self.current_sign = None
-        self.last_sign = None
-        self.start_time = 0
 
-    def update(self, detected_sign):
-        if detected_sign is None:
+    def update(self, detected_sign, conf=1.0):
+        now = self.clock.now()
+        self.samples.append((detected_sign, conf if detected_sign is not None else self.none_weight, now))
+        while self.samples and now - self.samples[0][2] > self.window_s:
+            self.samples.popleft()
+
+        scores = {}
+        votes = {}
+        first_seen = {}
+        total = 0.0
+        for label, weight, ts in self.samples:
+            total += weight
+            if label is None:
+                continue
+            scores[label] = scores.get(label, 0.0) + weight
+            votes[label] = votes.get(label, 0) + 1
+            first_seen.setdefault(label, ts)
+        if total <= 0:
+            return None
+
+        # hysteresis: keep the declared sign until it clearly lost the vote
+        if self.current_sign is not None:
+            if scores.get(self.current_sign, 0.0) / total >= self.exit_share:
+                return None
             self.current_sign = None
-            self.last_sign = None
-            self.start_time = 0
+
+        if not scores:
             return None
+        best = max(scores, key=scores.get)
+        if (scores[best] / total >= self.enter_share and votes[best] >= self.min_votes
+                and now - first_seen[best] >= self.hold_s):
+            self.current_sign = best
+            return best
+        return None
 
-        if detected_sign == self.last_sign:
-            if time.time() - self.start_time >= self.window_s:
-                if self.current_sign != detected_sign:
-                    self.current_sign = detected_sign
-                    return self.current_sign
-        else:
-            self.last_sign = detected_sign
-            self.start_time = time.time()
-        
-        return None # No change or not stabilized yet
+    def reset(self):
+        self.samples.clear()
+        self.current_sign = None
@@ -3,21 +3,31 @@
 # - Fireball: P1->P2 uses fireball.png, P2->P1 uses fireball2.png
 # - Heavy Attack: both directions use heavyattack.png
 # - Water Ball: both directions use WaterBall.png
-# Wall: skeleton_nobg.gif (green-screen keyed)
+# Wall: skeleton_nobg.gif (green-screen keyed once at load time)
 
+import argparse
 import os
 import cv2
 import pygame
 import time
 
 from cv.camera import Camera
+from cv.frame_source import PlaybackSource, RecordingSource
 from cv.yolo_detector import YOLODetector
+from cv.inference_backends import BACKENDS
+from cv.detection_pipeline import DetectionPipeline, clip_roi
+from cv.detector_pool import DetectorPool
+from cv.motion_gate import MotionGate
+from cv.hand_tracker import HandTracker
+from cv.crop_planner import CropPlanner
 from core.game_manager import GameManager, GameState
+from core.clock import REAL_CLOCK
 from ui.renderer import Renderer
 from logic.abilities import AbilityType
 
-from ui.vfx_overlay import overlay_png_at_point, overlay_gif_greenscreen_at_point
-from ui.vfx_gif import GifVFX
+from ui.vfx_overlay import overlay_sprite_at_point
+from ui.sprite_cache import SpriteCache
+from ui.vfx_gif import GifVFX, preload_gif, load_keyed_gif
 
 
 def load_sound(path: str, volume: float = 1.0):
@@ -40,15 +50,16 @@ def roi_center(rx1, ry1, rx2, ry2):
 
 
 class PNGProjectile:
-    def __init__(self, png_bgra, start_pos, end_pos, travel_time=0.6, size_px=260, alpha=1.0):
-        self.png = png_bgra
+    def __init__(self, sprite, start_pos, end_pos, travel_time=0.6, alpha=1.0, clock=None):
+        self.clock = clock or REAL_CLOCK
+        self.sprite = sprite  # shared, pre-scaled Sprite from SpriteCache
         self.start = start_pos
         self.end = end_pos
         self.travel_time = max(0.05, float(travel_time))
-        self.size_px = int(size_px)
+        self.size_px = sprite.size_px
         self.alpha = float(alpha)
 
-        self.t0 = time.time()
+        self.t0 = self.clock.now()
         self.done = False
         self.pos = start_pos
 
@@ -56,7 +67,7 @@ class PNGProjectile:
         if self.done:
             return False
 
-        t = (time.time() - self.t0) / self.travel_time
+        t = (self.clock.now() - self.t0) / self.travel_time
         if t >= 1.0:
             t = 1.0
             self.done = True
@@ -67,11 +78,78 @@ class PNGProjectile:
         return True
 
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Ninja Duel hand-sign game")
+    parser.add_argument("--headless", action="store_true",
+                        help="render offscreen without a window (and with a silent audio driver)")
+    parser.add_argument("--frames-out", default=None,
+                        help="directory to save every composited frame as PNG")
+    parser.add_argument("--max-frames", type=int, default=0,
+                        help="stop after this many frames (0 = run until quit)")
+    parser.add_argument("--fps", type=int, default=60,
+                        help="render frame cap (0 = uncapped, for throughput runs)")
+    parser.add_argument("--auto-start", action="store_true",
+                        help="start the match immediately instead of waiting for SPACE")
+    parser.add_argument("--source", default="0",
+                        help="camera index, or a recorded session dir / video file / image dir to replay")
+    parser.add_argument("--fast", action="store_true",
+                        help="replay recorded input as fast as possible instead of in real time")
+    parser.add_argument("--loop", action="store_true", help="loop recorded input")
+    parser.add_argument("--record", default=None,
+                        help="record the input frames of this session to a directory for replay")
+    parser.add_argument("--combat", choices=["classic", "vectorized"], default="classic",
+                        help="combat engine (vectorized = NumPy arrays, for many projectiles)")
+    parser.add_argument("--no-motion-gate", action="store_true",
+                        help="run the detector on every ROI of every frame, even when nothing moved")
+    parser.add_argument("--full-roi", action="store_true",
+                        help="always run the detector on the whole ROI instead of a crop around the last hand box")
+    parser.add_argument("--model", default=None,
+                        help="detector weights (default model/best.pt; a .onnx from cv.export_model runs on ONNX Runtime)")
+    parser.add_argument("--backend", choices=BACKENDS, default="auto",
+                        help="inference backend (auto = by model file extension)")
+    parser.add_argument("--imgsz", type=int, default=640,
+                        help="detector input size (e.g. 320/416/640; see python -m bench.bench_detector)")
+    parser.add_argument("--detect-mode", choices=["roi", "frame"], default="roi",
+                        help="roi = one crop per player ROI; frame = one pass over the whole (downscaled) frame, "
+                             "detections assigned to the ROI containing their center")
+    parser.add_argument("--frame-imgsz", type=int, default=None,
+                        help="input size for --detect-mode frame (default --imgsz; 1280 = full resolution)")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="run the detector in this many worker processes (0 = on a thread in the game process)")
+    parser.add_argument("--worker-threads", type=int, default=None,
+                        help="torch/OpenCV threads per detector worker (default: cores / workers)")
+    parser.add_argument("--sim-rate", type=int, default=120,
+                        help="fixed simulation rate in Hz, independent of the render/inference rate")
+    args = parser.parse_args(argv)
+    if args.workers > 0 and args.detect_mode == "frame":
+        # checked before the pool spawns anything
+        parser.error("--detect-mode frame runs in-process; it can't be combined with --workers")
+    return args
+
+
+def open_frame_source(args, width, height):
+    if args.source.isdigit():
+        source = Camera(camera_id=int(args.source), width=width, height=height, threaded=True)
+    else:
+        source = PlaybackSource(args.source, realtime=not args.fast, loop=args.loop,
+                                width=width, height=height)
+    if args.record:
+        source = RecordingSource(source, args.record)
+    return source
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
     WIDTH, HEIGHT = 1280, 720
-    FPS = 30
+    FPS = args.fps
     BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
+    if args.headless:
+        # no window and no sound card needed; events still work on the dummy driver
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
     # ---- Audio init ----
     pygame.mixer.pre_init(44100, -16, 2, 512)
     pygame.init()
@@ -94,13 +172,34 @@ def main():
           "wall", wall_sfx is not None)
 
     # ---- Game components ----
-    camera = Camera(width=WIDTH, height=HEIGHT)
-
-    model_path = os.path.join(BASE_DIR, "model", "best.pt")
-    detector = YOLODetector(model_path=model_path, confidence=0.5)
-
-    game_manager = GameManager(frame_width=WIDTH, frame_height=HEIGHT)
-    renderer = Renderer(width=WIDTH, height=HEIGHT)
+    camera = open_frame_source(args, WIDTH, HEIGHT)
+
+    model_path = args.model or os.path.join(BASE_DIR, "model", "best.pt")
+    detector = pool = None
+    if args.workers > 0:
+        pool = DetectorPool(model_path, workers=args.workers, max_shape=(HEIGHT, WIDTH, 3),
+                            threads=args.worker_threads, confidence=0.5, imgsz=args.imgsz, backend=args.backend)
+        pool.start()
+    else:
+        detector = YOLODetector(model_path=model_path, confidence=0.5, imgsz=args.imgsz, backend=args.backend)
+
+    game_manager = GameManager(frame_width=WIDTH, frame_height=HEIGHT, combat_engine=args.combat,
+                               sim_rate=args.sim_rate)
+    game_clock = game_manager.clock  # VFX timers follow the same clock as the game logic
+    renderer = Renderer(width=WIDTH, height=HEIGHT, headless=args.headless, output_dir=args.frames_out)
+
+    detection_pipeline = DetectionPipeline(
+        camera, detector,
+        rois=[p.roi for p in game_manager.players.values()],
+        frame_width=WIDTH, frame_height=HEIGHT,
+        max_staleness=0.5,
+        motion_gate=None if args.no_motion_gate else MotionGate(),
+        crop_planner=None if args.full_roi or args.detect_mode == "frame" else CropPlanner(),
+        pool=pool,
+        full_frame=args.detect_mode == "frame",
+        frame_imgsz=args.frame_imgsz
+    )
+    detection_pipeline.start()
 
     # ==========================================================
     # PNG PROJECTILES (load once)
@@ -120,6 +219,13 @@ def main():
     print("[INFO] heavyattack.png loaded?", heavy_png is not None, heavy_path)
     print("[INFO] WaterBall.png loaded?", water_png is not None, water_path)
 
+    # pre-scaled, premultiplied sprites are built once per (asset, size)
+    sprite_cache = SpriteCache(max_entries=16)
+    sprite_cache.register("fireball1", fireball1_png)
+    sprite_cache.register("fireball2", fireball2_png)
+    sprite_cache.register("heavy", heavy_png)
+    sprite_cache.register("water", water_png)
+
     # Tunings
     FIREBALL_SIZE = 260
     FIREBALL_TRAVEL_TIME = 0.6
@@ -143,6 +249,11 @@ def main():
     SKELETON_SIZE = 420
     SKELETON_DURATION = 5.0
     GREEN_TOL = 90  # tweak 70-130
+    GREEN_SOFTNESS = 0  # >0 feathers the key edge over that many color units
+
+    # decode + key once now (at render size) so casting WALL only creates a playhead
+    skeleton_key = dict(size_px=SKELETON_SIZE, key_bgr=(0, 255, 0), tol=GREEN_TOL, softness=GREEN_SOFTNESS)
+    print("[INFO] Skeleton GIF preloaded?", preload_gif(skeleton_gif_path, **skeleton_key))
 
     # ==========================================================
     # Positions for VFX
@@ -150,6 +261,15 @@ def main():
     last_hand_center = {1: None, 2: None}
     last_body_center = {1: None, 2: None}
 
+    # body center always available (ROIs are fixed)
+    # hand trackers follow the detected hand between detector runs
+    hand_trackers = {}
+    for player_id, player in game_manager.players.items():
+        box = clip_roi(player.roi, WIDTH, HEIGHT)
+        if box is not None:
+            last_body_center[player_id] = roi_center(*box)
+            hand_trackers[player_id] = HandTracker(box)
+
     # ---- Wrap trigger_ability to play SFX + spawn VFX ----
     _original_trigger = game_manager.trigger_ability
 
@@ -162,18 +282,18 @@ def main():
             return
 
         end = (end[0], end[1] - 60)
-        png = fireball1_png if caster_id == 1 else fireball2_png
-        if png is None:
+        sprite = sprite_cache.get("fireball1" if caster_id == 1 else "fireball2", FIREBALL_SIZE)
+        if sprite is None:
             print("[VFX] Fireball PNG missing (fireball.png/fireball2.png)")
             return
 
         projectiles.append(PNGProjectile(
-            png_bgra=png,
+            sprite=sprite,
             start_pos=start,
             end_pos=end,
             travel_time=FIREBALL_TRAVEL_TIME,
-            size_px=FIREBALL_SIZE,
-            alpha=1.0
+            alpha=1.0,
+            clock=game_clock
         ))
 
     def spawn_heavy_png(caster_id: int):
@@ -185,17 +305,18 @@ def main():
             return
 
         end = (end[0], end[1] - 40)
-        if heavy_png is None:
+        sprite = sprite_cache.get("heavy", HEAVY_SIZE)
+        if sprite is None:
             print("[VFX] heavyattack.png missing")
             return
 
         projectiles.append(PNGProjectile(
-            png_bgra=heavy_png,
+            sprite=sprite,
             start_pos=start,
             end_pos=end,
             travel_time=HEAVY_TRAVEL_TIME,
-            size_px=HEAVY_SIZE,
-            alpha=1.0
+            alpha=1.0,
+            clock=game_clock
         ))
 
     def spawn_water_png(caster_id: int):
@@ -207,24 +328,27 @@ def main():
             return
 
         end = (end[0], end[1] - 50)
-        if water_png is None:
+        sprite = sprite_cache.get("water", WATER_SIZE)
+        if sprite is None:
             print("[VFX] WaterBall.png missing")
             return
 
         projectiles.append(PNGProjectile(
-            png_bgra=water_png,
+            sprite=sprite,
             start_pos=start,
             end_pos=end,
             travel_time=WATER_TRAVEL_TIME,
-            size_px=WATER_SIZE,
-            alpha=1.0
+            alpha=1.0,
+            clock=game_clock
         ))
 
     def start_skeleton_wall(player_id: int):
         if not os.path.exists(skeleton_gif_path):
             return
-        skeleton_active_until[player_id] = time.time() + SKELETON_DURATION
-        skeleton_anim[player_id] = GifVFX(skeleton_gif_path, loop=True, fps=30)
+        skeleton_active_until[player_id] = game_clock.now() + SKELETON_DURATION
+        skeleton_anim[player_id] = GifVFX(skeleton_gif_path, loop=True, fps=30,
+                                          frames=load_keyed_gif(skeleton_gif_path, **skeleton_key),
+                                          clock=game_clock)
 
     def trigger_with_sound_and_vfx(player, ability):
         # ---- sound ----
@@ -287,6 +411,11 @@ def main():
     last_time = time.time()
     last_state = game_manager.state
 
+    if args.auto_start:
+        game_manager.start_game()  # music etc. follow through the normal state transition
+    loop_start = time.time()
+    frames = 0
+
     running = True
     while running:
         dt = time.time() - last_time
@@ -303,47 +432,36 @@ def main():
         frame = camera.get_frame()
         if frame is None:
             break
+        if detection_pipeline.error is not None:
+            break  # the detector pool failed (already reported)
 
         # ---------------------------
-        # YOLO only while playing
+        # YOLO only while playing (runs on the detection worker)
         # ---------------------------
-        if game_manager.state == GameState.PLAYING:
-            p1_sign = None
-            p2_sign = None
-
-            for player_id, player in game_manager.players.items():
-                roi = player.roi
-                rx1, ry1 = max(0, int(roi.x)), max(0, int(roi.y))
-                rx2, ry2 = min(WIDTH, int(roi.x + roi.w)), min(HEIGHT, int(roi.y + roi.h))
-                if rx2 <= rx1 or ry2 <= ry1:
+        detection_pipeline.set_enabled(game_manager.state == GameState.PLAYING)
+        result = game_manager.consume_detections(detection_pipeline)
+        if result is not None:
+            for player_id in result.inferred:
+                best = result.detections.get(player_id)
+                tracker = hand_trackers.get(player_id)
+                if best is not None and best.get("bbox") is not None and tracker is not None:
+                    # seed on the frame the box was found in; update() below catches up
+                    tracker.reset(result.frame if result.frame is not None else frame, best["bbox"])
                     continue
+                if tracker is not None:
+                    tracker.stop()
+                if result.hand_centers.get(player_id) is not None:
+                    last_hand_center[player_id] = result.hand_centers[player_id]
 
-                # body center always available
-                last_body_center[player_id] = roi_center(rx1, ry1, rx2, ry2)
-
-                roi_frame = frame[ry1:ry2, rx1:rx2]
-                detections = detector.detect(roi_frame)
-
-                if detections:
-                    best = max(detections, key=lambda d: d["conf"])
-                    label = best.get("label")
-
-                    if player_id == 1:
-                        p1_sign = label
-                    else:
-                        p2_sign = label
-
-                    # bbox is XYXY (from your prints)
-                    if "bbox" in best and best["bbox"] is not None:
-                        bx1, by1, bx2, by2 = best["bbox"]  # xyxy ROI coords
-                        fx1, fy1 = rx1 + bx1, ry1 + by1
-                        fx2, fy2 = rx1 + bx2, ry1 + by2
-                        last_hand_center[player_id] = (int((fx1 + fx2) / 2), int((fy1 + fy2) / 2))
-                    else:
-                        last_hand_center[player_id] = last_body_center[player_id]
-
-            game_manager.process_hand_sign(1, p1_sign)
-            game_manager.process_hand_sign(2, p2_sign)
+        if game_manager.state == GameState.PLAYING:
+            for player_id, tracker in hand_trackers.items():
+                center = tracker.update(frame)
+                if center is not None:
+                    last_hand_center[player_id] = center
+                if not tracker.lost():
+                    detection_pipeline.set_hand_hint(player_id, tracker.bbox)
+                if tracker.needs_redetect():
+                    detection_pipeline.request_refresh(player_id)
 
         # ---------------------------
         # Events
@@ -384,7 +502,7 @@ def main():
                     elif event.key == pygame.K_MINUS:
                         game_manager.trigger_ability(game_manager.players[2], AbilityType.WATER_BALL)
 
-        game_manager.update(dt)
+        game_manager.advance(dt)
 
         # ---------------------------
         # Draw PNG projectiles (fireball + heavy + water)
@@ -394,11 +512,10 @@ def main():
             if not proj.update():
                 continue
 
-            frame = overlay_png_at_point(
+            frame = overlay_sprite_at_point(
                 base_bgr=frame,
-                png_bgra=proj.png,
+                sprite=proj.sprite,
                 center_xy=proj.pos,
-                size_px=proj.size_px,
                 alpha=proj.alpha
             )
             alive.append(proj)
@@ -407,7 +524,7 @@ def main():
         # ---------------------------
         # Draw Skeleton (WALL)
         # ---------------------------
-        now = time.time()
+        now = game_clock.now()
         for pid in (1, 2):
             if skeleton_anim[pid] is None:
                 continue
@@ -415,8 +532,8 @@ def main():
                 skeleton_anim[pid] = None
                 continue
 
-            eff_frame = skeleton_anim[pid].update()
-            if eff_frame is None:
+            eff_sprite = skeleton_anim[pid].update()  # pre-keyed Sprite
+            if eff_sprite is None:
                 skeleton_anim[pid] = None
                 continue
 
@@ -424,22 +541,32 @@ def main():
             if pos is None:
                 continue
 
-            frame = overlay_gif_greenscreen_at_point(
+            frame = overlay_sprite_at_point(
                 base_bgr=frame,
-                gif_bgr=eff_frame,
+                sprite=eff_sprite,
                 center_xy=pos,
-                size_px=SKELETON_SIZE,
-                key_green=(0, 255, 0),
-                tol=GREEN_TOL,
                 alpha=1.0
             )
 
         renderer.render(frame, game_manager)
         clock.tick(FPS)
 
+        frames += 1
+        if args.max_frames and frames >= args.max_frames:
+            running = False
+
+    elapsed = max(1e-6, time.time() - loop_start)
+    print(f"[INFO] {frames} frames in {elapsed:.2f}s ({frames / elapsed:.1f} FPS), "
+          f"{detection_pipeline.inferences} inferences ({detection_pipeline.inferences / elapsed:.1f}/s), "
+          f"{detection_pipeline.skipped_inferences} ROI inferences skipped (no motion), "
+          f"camera dropped {camera.dropped_frames}")
+
+    detection_pipeline.stop()
+    if pool is not None:
+        pool.stop()
     camera.release()
-    renderer.quit()
     pygame.mixer.music.stop()
+    renderer.quit()  # pygame.quit(), so it goes last
 
 
 if __name__ == "__main__":
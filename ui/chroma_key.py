@@ -0,0 +1,31 @@
+# ui/chroma_key.py
+# One-time green-screen keying: turns BGR frames into ready-to-blend sprites,
+# so nothing is keyed per pixel while an effect is on screen.
+import cv2
+import numpy as np
+
+from ui.sprite_cache import sprite_from_planes
+
+
+def chroma_key_alpha(frame_bgr, key_bgr=(0, 255, 0), tol=80, softness=0.0):
+    """
+    Alpha (uint8, HxW) from the euclidean distance to key_bgr.
+    softness=0: hard key, 255 where dist > tol (same as the per-frame overlay).
+    softness>0: alpha ramps from 0 at tol to 255 at tol + softness.
+    """
+    key = np.array(key_bgr, dtype=np.float32).reshape(1, 1, 3)
+    dist = np.linalg.norm(frame_bgr.astype(np.float32) - key, axis=2)
+
+    if softness <= 0:
+        return np.where(dist > float(tol), 255, 0).astype(np.uint8)
+
+    ramp = (dist - float(tol)) / float(softness)
+    return np.rint(np.clip(ramp, 0.0, 1.0) * 255.0).astype(np.uint8)
+
+
+def keyed_sprite(name, frame_bgr, size_px, key_bgr=(0, 255, 0), tol=80, softness=0.0):
+    """Resize (like the per-frame overlay did) then key once into a Sprite."""
+    bgr = cv2.resize(frame_bgr, (size_px, size_px), interpolation=cv2.INTER_LINEAR)
+    alpha = chroma_key_alpha(bgr, key_bgr, tol, softness)
+    # only hard keys can drop the straight copy without changing partial-opacity draws
+    return sprite_from_planes(name, size_px, bgr, alpha, keep_straight=softness > 0)
@@ -0,0 +1,136 @@
+# ui/compositor.py
+# In-place uint8 alpha compositing on top of OpenCV's saturating, rounding ops.
+# Matches the old float32 math within +-1 LSB with no per-call allocations
+# once the scratch buffers have grown to the largest effect size.
+import cv2
+import numpy as np
+
+
+class BlendScratch:
+    """
+    Reusable scratch buffers, grown on demand and handed out as views.
+    One instance must not be used from two threads at the same time.
+    """
+    def __init__(self):
+        self._buffers = {}
+
+    def get(self, name, shape, dtype=np.uint8):
+        dtype = np.dtype(dtype)
+        n = int(np.prod(shape))
+        buf = self._buffers.get(name)
+        if buf is None or buf.dtype != dtype or buf.size < n:
+            buf = np.empty(n, dtype=dtype)
+            self._buffers[name] = buf
+        return buf[:n].reshape(shape)
+
+
+_default_scratch = BlendScratch()
+
+
+def _alpha3(alpha, opacity, scratch):
+    # (h,w) or (h,w,1) uint8 alpha -> (h,w,3) uint8 alpha scaled by opacity
+    h, w = alpha.shape[:2]
+    if alpha.ndim == 3:
+        alpha = alpha[:, :, 0]
+    if not alpha.flags.c_contiguous:
+        # e.g. the A plane of a BGRA image
+        a1 = scratch.get("a1", (h, w))
+        np.copyto(a1, alpha)
+        alpha = a1
+
+    a3 = scratch.get("a3", (h, w, 3))
+    cv2.cvtColor(alpha, cv2.COLOR_GRAY2BGR, dst=a3)
+    if opacity < 1.0:
+        cv2.convertScaleAbs(a3, dst=a3, alpha=float(opacity))
+    return a3
+
+
+def blend_straight(dst, src_bgr, alpha, opacity=1.0, scratch=None):
+    """
+    dst = dst * (1 - a) + src * a, in place, a = alpha/255 * opacity.
+    dst may be a strided view into a larger frame; alpha is (h,w) or (h,w,1).
+    """
+    if opacity <= 0.0:
+        return dst
+    scratch = scratch or _default_scratch
+    h, w = dst.shape[:2]
+
+    a3 = _alpha3(alpha, opacity, scratch)
+    inv3 = cv2.bitwise_not(a3, dst=scratch.get("inv3", (h, w, 3)))  # 255 - a
+    acc = scratch.get("acc", (h, w, 3), np.uint16)
+    tmp = scratch.get("tmp", (h, w, 3), np.uint16)
+    out = scratch.get("out", (h, w, 3))
+
+    # dst*(255-a) + src*a <= 255*255 fits uint16 exactly; one rounded /255 at the end
+    np.multiply(dst, inv3, out=acc, dtype=np.uint16)
+    np.multiply(src_bgr, a3, out=tmp, dtype=np.uint16)
+    np.add(acc, tmp, out=acc)
+    cv2.convertScaleAbs(acc, dst=out, alpha=1.0 / 255.0)
+    dst[...] = out  # OpenCV may not write through strided views, so copy back once
+    return dst
+
+
+def blend_premultiplied(dst, pm_bgr, inv_alpha3, scratch=None):
+    """
+    dst = dst * (1 - a) + pm, in place, for premultiplied pm_bgr at full opacity.
+    inv_alpha3: (h,w,3) uint8 255-alpha (precomputed by the sprite cache).
+    For partial opacity blend the straight-alpha source with blend_straight instead.
+    """
+    scratch = scratch or _default_scratch
+    h, w = dst.shape[:2]
+
+    out = scratch.get("out", (h, w, 3))
+    cv2.multiply(dst, inv_alpha3, dst=out, scale=1.0 / 255.0)
+    cv2.add(out, pm_bgr, dst=out)
+    dst[...] = out
+    return dst
+
+
+def blend_masked(dst, src_bgr, mask, opacity=1.0, scratch=None):
+    """Hard-mask blend: mask is (h,w) uint8, 255 = take src, 0 = keep dst."""
+    return blend_straight(dst, src_bgr, mask, opacity=opacity, scratch=scratch)
+
+
+def blackkey_mask(src_bgr, black_thresh, scratch=None):
+    """255 where the brightest channel is above black_thresh."""
+    scratch = scratch or _default_scratch
+    h, w = src_bgr.shape[:2]
+    bright = np.maximum(src_bgr[:, :, 0], src_bgr[:, :, 1], out=scratch.get("bright", (h, w)))
+    np.maximum(bright, src_bgr[:, :, 2], out=bright)
+    mask = scratch.get("mask", (h, w))
+    cv2.threshold(bright, float(black_thresh), 255, cv2.THRESH_BINARY, dst=mask)
+    return mask
+
+
+def greenscreen_mask(src_bgr, key_bgr, tol, scratch=None):
+    """255 where the pixel's euclidean distance from key_bgr is above tol."""
+    scratch = scratch or _default_scratch
+    h, w = src_bgr.shape[:2]
+    key = (float(key_bgr[0]), float(key_bgr[1]), float(key_bgr[2]), 0.0)
+
+    diff = cv2.absdiff(src_bgr, key, dst=scratch.get("diff", (h, w, 3)))
+    sq = np.multiply(diff, diff, out=scratch.get("sq", (h, w, 3), np.uint16), dtype=np.uint16)
+    dist2 = np.add(sq[:, :, 0], sq[:, :, 1], out=scratch.get("dist2", (h, w), np.int32), dtype=np.int32)
+    np.add(dist2, sq[:, :, 2], out=dist2)
+
+    mask = scratch.get("mask", (h, w))
+    # dist > tol  <=>  dist^2 > tol^2
+    cv2.compare(dist2, float(tol) * float(tol), cv2.CMP_GT, dst=mask)
+    return mask
+
+
+def resize_into(src, size_px, scratch=None, name="resized"):
+    scratch = scratch or _default_scratch
+    shape = (size_px, size_px) + src.shape[2:]
+    out = scratch.get(name, shape)
+    cv2.resize(src, (size_px, size_px), dst=out, interpolation=cv2.INTER_LINEAR)
+    return out
+
+
+def split_bgra(src_bgra, scratch=None):
+    """Contiguous (h,w,3) BGR and (h,w) alpha planes of a BGRA image."""
+    scratch = scratch or _default_scratch
+    h, w = src_bgra.shape[:2]
+    bgr = cv2.cvtColor(src_bgra, cv2.COLOR_BGRA2BGR, dst=scratch.get("split_bgr", (h, w, 3)))
+    a = cv2.extractChannel(src_bgra, 3, dst=scratch.get("split_a", (h, w)))
+    return bgr, a
@@ -0,0 +1,36 @@
+# ui/hud.py
+
+
+class HudCache:
+    """
+    Cached HUD elements. Each element id keeps the state it was last built
+    for (the *displayed* value, e.g. the "1.3s" text rather than the float
+    cooldown) and its surfaces; they are only rebuilt when that state changes.
+    Cached surfaces are still blitted every frame: there is no dirty-region
+    redraw, because the camera frame underneath is redrawn every frame anyway.
+    """
+    def __init__(self):
+        self._elements = {}  # element_id -> (state, value)
+
+        # stats
+        self.redraws_this_frame = 0
+        self.last_frame_redraws = 0
+        self.total_redraws = 0
+
+    def begin_frame(self):
+        self.last_frame_redraws = self.redraws_this_frame
+        self.redraws_this_frame = 0
+
+    def get(self, element_id, state, build):
+        cached = self._elements.get(element_id)
+        if cached is not None and cached[0] == state:
+            return cached[1]
+
+        value = build()
+        self._elements[element_id] = (state, value)
+        self.redraws_this_frame += 1
+        self.total_redraws += 1
+        return value
+
+    def clear(self):
+        self._elements.clear()
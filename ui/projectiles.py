@@ -1,19 +1,20 @@
 # ui/projectiles.py
-import time
+from core.clock import REAL_CLOCK
 
 class GifProjectile:
     """
     Moves from start_pos -> end_pos over 'travel_time' seconds.
     Uses a GifVFX instance to animate the fireball frames.
     """
-    def __init__(self, gif_vfx, start_pos, end_pos, travel_time=0.6, size_px=220):
+    def __init__(self, gif_vfx, start_pos, end_pos, travel_time=0.6, size_px=220, clock=None):
+        self.clock = clock or REAL_CLOCK
         self.vfx = gif_vfx
         self.start = start_pos
         self.end = end_pos
         self.travel_time = max(0.05, float(travel_time))
         self.size_px = int(size_px)
 
-        self.t0 = time.time()
+        self.t0 = self.clock.now()
         self.done = False
         self.pos = start_pos
 
@@ -29,7 +30,7 @@ class GifProjectile:
             return None
 
         # update position by time
-        t = (time.time() - self.t0) / self.travel_time
+        t = (self.clock.now() - self.t0) / self.travel_time
         if t >= 1.0:
             t = 1.0
             self.done = True
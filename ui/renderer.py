@@ -1,31 +1,64 @@
+import os
 import pygame
-import cv2
 import numpy as np
 from core.game_manager import GameState
+from ui.hud import HudCache
 
 class Renderer:
-    def __init__(self, width=1280, height=720):
+    """
+    headless=True draws into an offscreen surface instead of a window and
+    skips presentation. output_dir (optional) saves every composited frame
+    there as an image sequence (frame_000000.png, ...).
+    """
+    def __init__(self, width=1280, height=720, headless=False, output_dir=None):
         pygame.init()
-        self.screen = pygame.display.set_mode((width, height))
-        pygame.display.set_caption("Ninja Duel: Cloud9 x JetBrains")
+        self.headless = headless
+        if headless:
+            self.screen = pygame.Surface((width, height))
+        else:
+            self.screen = pygame.display.set_mode((width, height))
+            pygame.display.set_caption("Ninja Duel: Cloud9 x JetBrains")
+
+        self.output_dir = output_dir
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        self.frames_rendered = 0
+
         self.font_large = pygame.font.SysFont("Arial", 64, bold=True)
         self.font_small = pygame.font.SysFont("Arial", 24)
         self.width = width
         self.height = height
+        self._scaled = None  # persistent scale target for off-size camera frames
+        # text/bar surfaces are rebuilt only when their displayed value changes;
+        # hud.last_frame_redraws tells how many were rebuilt for the previous frame
+        self.hud = HudCache()
+
+    def upload_frame(self, frame):
+        """
+        Put an OpenCV frame (BGR) on the screen with a single copy.
+        The surface wraps the frame's memory as BGR (no conversion array) and
+        the blit converts straight into the display surface. Off-size frames
+        take one extra scale into a reused surface.
+        """
+        if not frame.flags.c_contiguous:
+            frame = np.ascontiguousarray(frame)
+
+        h, w = frame.shape[:2]
+        surface = pygame.image.frombuffer(frame, (w, h), "BGR")
+
+        # Scale to screen if necessary (into a reused surface of the same pixel format)
+        if (w, h) != (self.width, self.height):
+            if self._scaled is None:
+                self._scaled = pygame.Surface((self.width, self.height), 0, surface)
+            pygame.transform.scale(surface, (self.width, self.height), self._scaled)
+            surface = self._scaled
 
-    def render(self, frame, game_manager):
-        # Convert OpenCV frame (BGR) to Pygame surface (RGB)
-        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        frame = np.rot90(frame)
-        frame = cv2.flip(frame, 0)
-        surface = pygame.surfarray.make_surface(frame)
-        
-        # Scale to screen if necessary
-        if surface.get_size() != (self.width, self.height):
-            surface = pygame.transform.scale(surface, (self.width, self.height))
-            
         self.screen.blit(surface, (0, 0))
 
+    def render(self, frame, game_manager):
+        self.hud.begin_frame()
+        self.upload_frame(frame)
+
         # Draw ROI Boxes
         for player in game_manager.players.values():
             roi = player.roi
@@ -64,10 +97,19 @@ class Renderer:
         elif game_manager.state == GameState.GAME_OVER:
             winner_text = f"PLAYER {game_manager.winner} WINS!"
             self.draw_overlay(winner_text, (255, 215, 0))
-            sub_text = self.font_small.render("PRESS R TO RESTART", True, (255, 255, 255))
+            sub_text = self.hud.get("restart_hint", None,
+                                    lambda: self.font_small.render("PRESS R TO RESTART", True, (255, 255, 255)))
             self.screen.blit(sub_text, (self.width//2 - sub_text.get_width()//2, self.height//2 + 50))
 
-        pygame.display.flip()
+        self.present()
+
+    def present(self):
+        if not self.headless:
+            pygame.display.flip()
+        if self.output_dir:
+            path = os.path.join(self.output_dir, f"frame_{self.frames_rendered:06d}.png")
+            pygame.image.save(self.screen, path)
+        self.frames_rendered += 1
 
     def draw_hp_bar(self, player):
         roi = player.roi
@@ -75,17 +117,26 @@ class Renderer:
         bar_h = 20
         x = roi.x + (roi.w - bar_w) // 2
         y = roi.y - 40
-        
+        fill_w = int(bar_w * (player.hp / player.max_hp))
+
+        bar = self.hud.get(("hp_bar", player.player_id), fill_w,
+                           lambda: self._build_hp_bar(bar_w, bar_h, fill_w))
+        self.screen.blit(bar, (x, y))
+
+        text = f"P{player.player_id} HP: {int(player.hp)}"
+        label = self.hud.get(("hp_label", player.player_id), text,
+                             lambda: self.font_small.render(text, True, (255, 255, 255)))
+        self.screen.blit(label, (x, y - 30))
+
+    def _build_hp_bar(self, bar_w, bar_h, fill_w):
+        bar = pygame.Surface((bar_w, bar_h))
         # Background
-        pygame.draw.rect(self.screen, (100, 0, 0), (x, y, bar_w, bar_h))
+        pygame.draw.rect(bar, (100, 0, 0), (0, 0, bar_w, bar_h))
         # Fill
-        fill_w = int(bar_w * (player.hp / player.max_hp))
-        pygame.draw.rect(self.screen, (0, 255, 0), (x, y, fill_w, bar_h))
+        pygame.draw.rect(bar, (0, 255, 0), (0, 0, fill_w, bar_h))
         # Border
-        pygame.draw.rect(self.screen, (255, 255, 255), (x, y, bar_w, bar_h), 2)
-        
-        label = self.font_small.render(f"P{player.player_id} HP: {int(player.hp)}", True, (255, 255, 255))
-        self.screen.blit(label, (x, y - 30))
+        pygame.draw.rect(bar, (255, 255, 255), (0, 0, bar_w, bar_h), 2)
+        return bar
 
     def draw_cooldowns(self, player):
         roi = player.roi
@@ -93,8 +144,10 @@ class Renderer:
         y = roi.y + roi.h + 10
         for i, (ability, cd) in enumerate(player.cooldowns.items()):
             color = (255, 255, 255) if cd <= 0 else (150, 150, 150)
+            # keyed by the displayed text, so it only re-renders every 0.1 s
             text = f"{ability.value}: {cd:.1f}s"
-            img = self.font_small.render(text, True, color)
+            img = self.hud.get(("cooldown", player.player_id, ability), (text, color),
+                               lambda: self.font_small.render(text, True, color))
             self.screen.blit(img, (x, y + i * 25))
 
     def draw_current_sign(self, player):
@@ -102,7 +155,8 @@ class Renderer:
             roi = player.roi
             text = f"SIGN: {player.current_sign.upper()}"
             color = (255, 255, 0) # Yellow for visibility
-            img = self.font_small.render(text, True, color)
+            img = self.hud.get(("sign", player.player_id), text,
+                               lambda: self.font_small.render(text, True, color))
             
             # Position it inside or near the ROI
             x = roi.x + 5
@@ -110,14 +164,18 @@ class Renderer:
             self.screen.blit(img, (x, y))
 
     def draw_overlay(self, text, color):
-        img = self.font_large.render(text, True, color)
-        bg = pygame.Surface((img.get_width() + 40, img.get_height() + 40))
-        bg.fill((0, 0, 0))
-        bg.set_alpha(150)
+        bg, img = self.hud.get("overlay", (text, color), lambda: self._build_overlay(text, color))
         x = self.width // 2 - bg.get_width() // 2
         y = self.height // 2 - bg.get_height() // 2
         self.screen.blit(bg, (x, y))
         self.screen.blit(img, (self.width // 2 - img.get_width() // 2, self.height // 2 - img.get_height() // 2))
 
+    def _build_overlay(self, text, color):
+        img = self.font_large.render(text, True, color)
+        bg = pygame.Surface((img.get_width() + 40, img.get_height() + 40))
+        bg.fill((0, 0, 0))
+        bg.set_alpha(150)
+        return bg, img
+
     def quit(self):
         pygame.quit()
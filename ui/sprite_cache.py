@@ -0,0 +1,102 @@
+# ui/sprite_cache.py
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+
+class Sprite:
+    """
+    A pre-scaled, ready-to-blend sprite.
+    pm_bgr: (S,S,3) uint8 BGR premultiplied by alpha
+    alpha:  (S,S,1) uint8 alpha
+    inv_alpha3: (S,S,3) uint8 255-alpha, ready for the compositor's fast path
+    bgr:    (S,S,3) uint8 straight BGR, used when drawing at partial opacity
+            (None = reuse pm_bgr, exact for hard 0/255 masks such as chroma keys)
+    """
+    def __init__(self, name, size_px, pm_bgr, alpha, bgr=None):
+        self.name = name
+        self.size_px = size_px
+        self.pm_bgr = pm_bgr
+        self.alpha = alpha
+        self.inv_alpha3 = np.ascontiguousarray(np.repeat(255 - alpha, 3, axis=2))
+        self.bgr = bgr if bgr is not None else pm_bgr
+
+        # read-only: the same arrays are shared by every projectile using this sprite
+        for arr in (self.pm_bgr, self.alpha, self.inv_alpha3, self.bgr):
+            arr.flags.writeable = False
+
+
+def make_sprite(name, png_bgra, size_px):
+    png = cv2.resize(png_bgra, (size_px, size_px), interpolation=cv2.INTER_LINEAR)
+    if png.ndim == 2:
+        png = cv2.cvtColor(png, cv2.COLOR_GRAY2BGRA)
+    elif png.shape[2] == 3:
+        png = cv2.cvtColor(png, cv2.COLOR_BGR2BGRA)
+
+    return sprite_from_planes(name, size_px, png[:, :, :3], png[:, :, 3])
+
+
+def sprite_from_planes(name, size_px, bgr, alpha, keep_straight=True):
+    """
+    Build a Sprite from already-scaled (S,S,3) BGR and (S,S) or (S,S,1) alpha planes.
+    keep_straight=False saves the straight BGR copy (see Sprite.bgr).
+    """
+    bgr = np.ascontiguousarray(bgr)
+    alpha = np.ascontiguousarray(alpha.reshape(alpha.shape[0], alpha.shape[1], 1))
+    pm_bgr = np.rint(bgr.astype(np.float32) * (alpha.astype(np.float32) / 255.0)).astype(np.uint8)
+    return Sprite(name, size_px, pm_bgr, alpha, bgr if keep_straight else None)
+
+
+class SpriteCache:
+    """
+    Source images are registered once by name; get(name, size_px) returns a
+    shared Sprite scaled to that size, building it on first use.
+    Least recently used sprites are evicted past max_entries.
+    """
+    def __init__(self, max_entries=32):
+        self.max_entries = max(1, int(max_entries))
+        self._sources = {}
+        self._sprites = OrderedDict()  # (name, size_px) -> Sprite
+
+        # stats
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def register(self, name, png_bgra):
+        if png_bgra is None:
+            return False
+        self._sources[name] = png_bgra
+        # a re-registered asset must not serve sprites built from the old image
+        for key in [k for k in self._sprites if k[0] == name]:
+            del self._sprites[key]
+        return True
+
+    def has(self, name):
+        return name in self._sources
+
+    def get(self, name, size_px):
+        size_px = int(size_px)
+        key = (name, size_px)
+
+        sprite = self._sprites.get(key)
+        if sprite is not None:
+            self._sprites.move_to_end(key)
+            self.hits += 1
+            return sprite
+
+        src = self._sources.get(name)
+        if src is None or size_px <= 0:
+            return None
+
+        self.misses += 1
+        sprite = make_sprite(name, src, size_px)
+        self._sprites[key] = sprite
+        while len(self._sprites) > self.max_entries:
+            self._sprites.popitem(last=False)
+            self.evictions += 1
+        return sprite
+
+    def clear(self):
+        self._sprites.clear()
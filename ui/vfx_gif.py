@@ -1,40 +1,101 @@
 # ui/vfx_gif.py
-import time
+import threading
 import cv2
 import numpy as np
 from PIL import Image, ImageSequence
 
+from core.clock import REAL_CLOCK
+from ui.chroma_key import keyed_sprite
+
+# Process-wide decoded animations: path -> tuple of read-only BGR frames,
+# (path, size, key, tol, softness) -> tuple of keyed Sprites.
+# Every GifVFX playing the same file shares these arrays.
+_decoded = {}
+_decoded_lock = threading.Lock()
+
+
+def _decode_gif(path):
+    frames = []
+    img = Image.open(path)
+    for frame in ImageSequence.Iterator(img):
+        # Convert to RGBA, then to BGR for OpenCV pipeline
+        rgba = frame.convert("RGBA")
+        arr = np.array(rgba)  # (H,W,4) RGBA
+        bgr = cv2.cvtColor(arr, cv2.COLOR_RGBA2BGR)
+        bgr.flags.writeable = False
+        frames.append(bgr)
+    return tuple(frames)
+
+
+def load_gif_frames(path):
+    """Decode a GIF once per process (lazily) and return its shared frames."""
+    with _decoded_lock:
+        frames = _decoded.get(path)
+        if frames is None:
+            frames = _decode_gif(path)
+            _decoded[path] = frames
+        return frames
+
+
+def load_keyed_gif(path, size_px, key_bgr=(0, 255, 0), tol=80, softness=0.0):
+    """
+    Green-screen GIF keyed once into Sprites at their render size
+    (draw with overlay_sprite_at_point). Shared like the decoded frames.
+    """
+    cache_key = (path, int(size_px), tuple(key_bgr), float(tol), float(softness))
+    frames = load_gif_frames(path)
+    with _decoded_lock:
+        sprites = _decoded.get(cache_key)
+        if sprites is None:
+            sprites = tuple(
+                keyed_sprite(f"{path}#{i}", f, int(size_px), key_bgr, tol, softness)
+                for i, f in enumerate(frames)
+            )
+            _decoded[cache_key] = sprites
+        return sprites
+
+
+def preload_gif(path, **keyed):
+    """
+    Decode at startup so the first cast doesn't hitch; pass size_px/key_bgr/tol/softness
+    to also build the keyed sprites. Returns False if it can't be loaded.
+    """
+    try:
+        if keyed:
+            return len(load_keyed_gif(path, **keyed)) > 0
+        return len(load_gif_frames(path)) > 0
+    except Exception as e:
+        print(f"[WARN] Could not preload GIF: {path} ({e})")
+        return False
+
+
 class GifVFX:
-    def __init__(self, path, loop=False, fps=30):
+    """
+    A lightweight playhead into the shared frames of a GIF.
+    frames: optional pre-built frame sequence (e.g. from load_keyed_gif); update()
+    then returns those items instead of BGR arrays.
+    """
+    def __init__(self, path, loop=False, fps=30, frames=None, clock=None):
+        self.clock = clock or REAL_CLOCK
         self.path = path
         self.loop = loop
         self.fps = fps
         self.frame_dt = 1.0 / float(fps)
 
-        self.frames = []
-        self._load_frames()
+        self.frames = frames if frames is not None else load_gif_frames(path)
 
         if not self.frames:
             raise RuntimeError(f"Could not load GIF frames: {path}")
 
         self.i = 0
-        self.last_t = time.time()
+        self.last_t = self.clock.now()
         self.done = False
 
-    def _load_frames(self):
-        img = Image.open(self.path)
-        for frame in ImageSequence.Iterator(img):
-            # Convert to RGBA, then to BGR for OpenCV pipeline
-            rgba = frame.convert("RGBA")
-            arr = np.array(rgba)  # (H,W,4) RGBA
-            bgr = cv2.cvtColor(arr, cv2.COLOR_RGBA2BGR)
-            self.frames.append(bgr)
-
     def update(self):
         if self.done:
             return None
 
-        now = time.time()
+        now = self.clock.now()
         if (now - self.last_t) >= self.frame_dt:
             self.i += 1
             self.last_t = now
@@ -1,16 +1,14 @@
 # ui/vfx_overlay.py
-import cv2
-import numpy as np
+from ui.compositor import (blend_straight, blend_premultiplied, blend_masked,
+                           blackkey_mask, greenscreen_mask, resize_into, split_bgra)
 
-def overlay_png_at_point(base_bgr, png_bgra, center_xy, size_px=240, alpha=1.0):
-    if png_bgra is None:
-        return base_bgr
 
-    H, W = base_bgr.shape[:2]
+def _placement(base_shape, center_xy, size_px):
+    """Clip a size_px square centered at center_xy to the frame.
+    Returns (frame_box, effect_box) as (x1, y1, x2, y2) pairs, or None if off-screen."""
+    H, W = base_shape[:2]
     cx, cy = center_xy
 
-    png = cv2.resize(png_bgra, (size_px, size_px), interpolation=cv2.INTER_LINEAR)
-
     x1 = int(cx - size_px // 2)
     y1 = int(cy - size_px // 2)
     x2 = x1 + size_px
@@ -19,23 +17,32 @@ def overlay_png_at_point(base_bgr, png_bgra, center_xy, size_px=240, alpha=1.0):
     sx1, sy1 = max(0, x1), max(0, y1)
     sx2, sy2 = min(W, x2), min(H, y2)
     if sx2 <= sx1 or sy2 <= sy1:
-        return base_bgr
+        return None
 
     ex1, ey1 = sx1 - x1, sy1 - y1
     ex2, ey2 = ex1 + (sx2 - sx1), ey1 + (sy2 - sy1)
+    return (sx1, sy1, sx2, sy2), (ex1, ey1, ex2, ey2)
 
-    region = base_bgr[sy1:sy2, sx1:sx2].astype(np.float32)
-    eff = png[ey1:ey2, ex1:ex2].astype(np.float32)  # BGRA
 
-    bgr = eff[:, :, :3]
-    a = (eff[:, :, 3:4] / 255.0) * float(alpha)
+def overlay_png_at_point(base_bgr, png_bgra, center_xy, size_px=240, alpha=1.0, scratch=None):
+    if png_bgra is None:
+        return base_bgr
 
-    comp = region * (1.0 - a) + bgr * a
-    base_bgr[sy1:sy2, sx1:sx2] = np.clip(comp, 0, 255).astype(np.uint8)
+    placed = _placement(base_bgr.shape, center_xy, size_px)
+    if placed is None:
+        return base_bgr
+    (sx1, sy1, sx2, sy2), (ex1, ey1, ex2, ey2) = placed
+
+    png = resize_into(png_bgra, size_px, scratch)  # BGRA
+    bgr, a = split_bgra(png, scratch)
+
+    blend_straight(base_bgr[sy1:sy2, sx1:sx2], bgr[ey1:ey2, ex1:ex2], a[ey1:ey2, ex1:ex2],
+                   opacity=alpha, scratch=scratch)
     return base_bgr
 
 
-def overlay_gif_blackkey_at_point(base_bgr, gif_bgr, center_xy, size_px=240, black_thresh=35, alpha=1.0):
+def overlay_gif_blackkey_at_point(base_bgr, gif_bgr, center_xy, size_px=240, black_thresh=35, alpha=1.0,
+                                  scratch=None):
     """
     Overlay a GIF frame (BGR) that has a black background.
     Removes black pixels using a brightness threshold.
@@ -43,39 +50,21 @@ def overlay_gif_blackkey_at_point(base_bgr, gif_bgr, center_xy, size_px=240, bla
     if gif_bgr is None:
         return base_bgr
 
-    H, W = base_bgr.shape[:2]
-    cx, cy = center_xy
-
-    eff = cv2.resize(gif_bgr, (size_px, size_px), interpolation=cv2.INTER_LINEAR)
-
-    x1 = int(cx - size_px // 2)
-    y1 = int(cy - size_px // 2)
-    x2 = x1 + size_px
-    y2 = y1 + size_px
-
-    sx1, sy1 = max(0, x1), max(0, y1)
-    sx2, sy2 = min(W, x2), min(H, y2)
-    if sx2 <= sx1 or sy2 <= sy1:
+    placed = _placement(base_bgr.shape, center_xy, size_px)
+    if placed is None:
         return base_bgr
+    (sx1, sy1, sx2, sy2), (ex1, ey1, ex2, ey2) = placed
 
-    ex1, ey1 = sx1 - x1, sy1 - y1
-    ex2, ey2 = ex1 + (sx2 - sx1), ey1 + (sy2 - sy1)
-
-    region = base_bgr[sy1:sy2, sx1:sx2].astype(np.float32)
-    e = eff[ey1:ey2, ex1:ex2].astype(np.float32)
-
-    brightness = np.max(e, axis=2)  # 0..255
-    mask = (brightness > float(black_thresh)).astype(np.float32)[..., None]
+    eff = resize_into(gif_bgr, size_px, scratch)
+    e = eff[ey1:ey2, ex1:ex2]
 
-    a = float(alpha)
-    comp = region * (1.0 - mask * a) + e * (mask * a)
-    base_bgr[sy1:sy2, sx1:sx2] = np.clip(comp, 0, 255).astype(np.uint8)
+    mask = blackkey_mask(e, black_thresh, scratch)
+    blend_masked(base_bgr[sy1:sy2, sx1:sx2], e, mask, opacity=alpha, scratch=scratch)
     return base_bgr
-import cv2
-import numpy as np
+
 
 def overlay_gif_greenscreen_at_point(base_bgr, gif_bgr, center_xy, size_px=320,
-                                    key_green=(0, 255, 0), tol=80, alpha=1.0):
+                                    key_green=(0, 255, 0), tol=80, alpha=1.0, scratch=None):
     """
     Overlay a GIF frame (BGR) that has a green-screen background.
     Removes pixels close to key_green.
@@ -84,32 +73,38 @@ def overlay_gif_greenscreen_at_point(base_bgr, gif_bgr, center_xy, size_px=320,
     if gif_bgr is None:
         return base_bgr
 
-    H, W = base_bgr.shape[:2]
-    cx, cy = center_xy
-
-    eff = cv2.resize(gif_bgr, (size_px, size_px), interpolation=cv2.INTER_LINEAR)
-
-    x1 = int(cx - size_px // 2)
-    y1 = int(cy - size_px // 2)
-    x2 = x1 + size_px
-    y2 = y1 + size_px
-
-    sx1, sy1 = max(0, x1), max(0, y1)
-    sx2, sy2 = min(W, x2), min(H, y2)
-    if sx2 <= sx1 or sy2 <= sy1:
+    placed = _placement(base_bgr.shape, center_xy, size_px)
+    if placed is None:
         return base_bgr
+    (sx1, sy1, sx2, sy2), (ex1, ey1, ex2, ey2) = placed
 
-    ex1, ey1 = sx1 - x1, sy1 - y1
-    ex2, ey2 = ex1 + (sx2 - sx1), ey1 + (sy2 - sy1)
+    eff = resize_into(gif_bgr, size_px, scratch)
+    e = eff[ey1:ey2, ex1:ex2]
 
-    region = base_bgr[sy1:sy2, sx1:sx2].astype(np.float32)
-    e = eff[ey1:ey2, ex1:ex2].astype(np.float32)
+    mask = greenscreen_mask(e, key_green, tol, scratch)  # keep non-green
+    blend_masked(base_bgr[sy1:sy2, sx1:sx2], e, mask, opacity=alpha, scratch=scratch)
+    return base_bgr
 
-    key = np.array(key_green, dtype=np.float32).reshape(1, 1, 3)
-    dist = np.linalg.norm(e - key, axis=2)  # distance from green
-    mask = (dist > float(tol)).astype(np.float32)[..., None]  # keep non-green
 
-    a = float(alpha)
-    comp = region * (1.0 - mask * a) + e * (mask * a)
-    base_bgr[sy1:sy2, sx1:sx2] = np.clip(comp, 0, 255).astype(np.uint8)
+def overlay_sprite_at_point(base_bgr, sprite, center_xy, alpha=1.0, scratch=None):
+    """
+    Overlay a cached, pre-scaled premultiplied-alpha Sprite (see ui/sprite_cache.py).
+    Same result as overlay_png_at_point with the sprite's source PNG and size,
+    without resizing the source every frame.
+    """
+    if sprite is None:
+        return base_bgr
+
+    placed = _placement(base_bgr.shape, center_xy, sprite.size_px)
+    if placed is None:
+        return base_bgr
+    (sx1, sy1, sx2, sy2), (ex1, ey1, ex2, ey2) = placed
+
+    region = base_bgr[sy1:sy2, sx1:sx2]
+    if alpha >= 1.0:
+        blend_premultiplied(region, sprite.pm_bgr[ey1:ey2, ex1:ex2], sprite.inv_alpha3[ey1:ey2, ex1:ex2],
+                            scratch=scratch)
+    else:
+        blend_straight(region, sprite.bgr[ey1:ey2, ex1:ex2], sprite.alpha[ey1:ey2, ex1:ex2],
+                       opacity=alpha, scratch=scratch)
     return base_bgr
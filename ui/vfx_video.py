@@ -1,8 +1,10 @@
 import cv2
-import time
+
+from core.clock import REAL_CLOCK
 
 class VideoVFX:
-    def __init__(self, path, loop=False, fps_override=None):
+    def __init__(self, path, loop=False, fps_override=None, clock=None):
+        self.clock = clock or REAL_CLOCK
         self.path = path
         self.loop = loop
         self.cap = cv2.VideoCapture(path)
@@ -20,7 +22,7 @@ class VideoVFX:
 
     def restart(self):
         self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
-        self.last_t = time.time()
+        self.last_t = self.clock.now()
         self.done = False
         self.frame = None
 
@@ -28,7 +30,7 @@ class VideoVFX:
         if self.done:
             return None
 
-        now = time.time()
+        now = self.clock.now()
         if self.frame is None or (now - self.last_t) >= self.frame_dt:
             ok, frame = self.cap.read()
             if not ok: